@@ -1,7 +1,7 @@
 import asyncio
 from logging.config import fileConfig
 
-from sqlalchemy import pool
+from sqlalchemy import pool, text
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
@@ -17,6 +17,9 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Arbitrary constant shared by every process that may run migrations
+MIGRATION_LOCK_KEY = 7_305_901
+
 
 def get_url() -> str:
     return settings.database_url
@@ -40,6 +43,12 @@ def do_run_migrations(connection: Connection) -> None:
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
+        if connection.dialect.name == "postgresql":
+            # Containers started with --migrate at the same time queue here;
+            # the first applies the migrations, the rest find head current
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
         context.run_migrations()
 
 
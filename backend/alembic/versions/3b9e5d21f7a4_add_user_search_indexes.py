@@ -0,0 +1,44 @@
+"""Add user search indexes
+
+Revision ID: 3b9e5d21f7a4
+Revises: 68674220c413
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e5d21f7a4'
+down_revision: Union[str, None] = '68674220c413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigram GIN indexes serve substring search (3+ characters); the
+# text_pattern_ops B-trees serve the short prefix searches trigrams cannot.
+INDEXES = {
+    'ix_users_email_trgm': ('lower(email) gin_trgm_ops', 'gin'),
+    'ix_users_full_name_trgm': ('lower(full_name) gin_trgm_ops', 'gin'),
+    'ix_users_email_prefix': ('lower(email) text_pattern_ops', 'btree'),
+    'ix_users_full_name_prefix': ('lower(full_name) text_pattern_ops', 'btree'),
+}
+
+
+def upgrade() -> None:
+    # The admin listing falls back to sequential scans on other databases
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, (expression, method) in INDEXES.items():
+        op.create_index(name, 'users', [sa.text(expression)], postgresql_using=method)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name in INDEXES:
+        op.drop_index(name, table_name='users')
+    # pg_trgm is left installed; other objects may depend on it
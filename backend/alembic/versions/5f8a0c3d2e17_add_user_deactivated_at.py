@@ -0,0 +1,38 @@
+"""Add users.deactivated_at
+
+Revision ID: 5f8a0c3d2e17
+Revises: e41d7b0c5a92
+Create Date: 2026-10-19 20:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f8a0c3d2e17'
+down_revision: Union[str, None] = 'e41d7b0c5a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deactivated_at', sa.DateTime(timezone=True), nullable=True))
+    # Accounts deleted before this migration start their grace period now
+    op.execute("UPDATE users SET deactivated_at = CURRENT_TIMESTAMP WHERE is_active = false")
+    op.create_index(
+        'ix_users_deactivated_at',
+        'users',
+        ['deactivated_at'],
+        unique=False,
+        postgresql_where=sa.text('deactivated_at IS NOT NULL'),
+        sqlite_where=sa.text('deactivated_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_deactivated_at', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('deactivated_at')
@@ -0,0 +1,80 @@
+"""Store refresh tokens by SHA-256 digest
+
+Revision ID: 68674220c413
+Revises: cd18203c0451
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '68674220c413'
+down_revision: Union[str, None] = 'cd18203c0451'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+refresh_tokens = sa.table(
+    'refresh_tokens',
+    sa.column('id', sa.Integer()),
+    sa.column('token', sa.String()),
+    sa.column('token_hash', sa.LargeBinary()),
+)
+
+
+def backfill_token_hashes() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        conn.execute(sa.text(
+            "UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))"
+        ))
+        return
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(refresh_tokens.c.id, refresh_tokens.c.token)
+            .where(refresh_tokens.c.id > last_id)
+            .order_by(refresh_tokens.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        conn.execute(
+            refresh_tokens.update()
+            .where(refresh_tokens.c.id == sa.bindparam('row_id'))
+            .values(token_hash=sa.bindparam('digest')),
+            [
+                {'row_id': row.id, 'digest': hashlib.sha256(row.token.encode()).digest()}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    backfill_token_hashes()
+    # Batch mode so SQLite (which cannot ALTER COLUMN) rebuilds the table
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.alter_column('token_hash', existing_type=sa.LargeBinary(length=32), nullable=False)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_token_hash'), ['token_hash'], unique=True)
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_token'))
+        batch_op.drop_column('token')
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into tokens, so existing sessions are
+    # dropped and users have to log in again.
+    op.execute(refresh_tokens.delete())
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=500), nullable=False))
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_token'), ['token'], unique=True)
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_token_hash'))
+        batch_op.drop_column('token_hash')
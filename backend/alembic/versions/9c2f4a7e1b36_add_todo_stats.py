@@ -0,0 +1,49 @@
+"""Add todo_stats counters
+
+Revision ID: 9c2f4a7e1b36
+Revises: 3b9e5d21f7a4
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2f4a7e1b36'
+down_revision: Union[str, None] = '3b9e5d21f7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+todos = sa.table(
+    'todos',
+    sa.column('user_id', sa.Integer()),
+    sa.column('completed', sa.Boolean()),
+    sa.column('priority', sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    todo_stats = op.create_table(
+        'todo_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'completed', 'priority'),
+    )
+    # One aggregate pass; from here on the todo services keep it current
+    op.execute(
+        todo_stats.insert().from_select(
+            ['user_id', 'completed', 'priority', 'count'],
+            sa.select(todos.c.user_id, todos.c.completed, todos.c.priority, sa.func.count())
+            .group_by(todos.c.user_id, todos.c.completed, todos.c.priority),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('todo_stats')
@@ -0,0 +1,50 @@
+"""Add todos_archive
+
+Revision ID: e41d7b0c5a92
+Revises: 9c2f4a7e1b36
+Create Date: 2026-10-19 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41d7b0c5a92'
+down_revision: Union[str, None] = '9c2f4a7e1b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'todos_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('completed', sa.Boolean(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_todos_archive_user_id'), 'todos_archive', ['user_id'], unique=False)
+    op.create_index(
+        'ix_todos_completed_updated_at',
+        'todos',
+        ['updated_at'],
+        unique=False,
+        postgresql_where=sa.text('completed'),
+        sqlite_where=sa.text('completed'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_completed_updated_at', table_name='todos')
+    op.drop_index(op.f('ix_todos_archive_user_id'), table_name='todos_archive')
+    op.drop_table('todos_archive')
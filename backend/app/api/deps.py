@@ -1,30 +1,36 @@
-from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_access_token
-from app.db.session import AsyncSessionLocal
+from app.db.session import bind_user, get_db, pin_primary
 from app.models.user import User
+from app.services.deactivation import deactivated_users
 from app.services.user import get_user_by_id
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that provides a database session."""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+def inactive_user_exception() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+
+
+async def get_primary_db(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncSession:
+    """Dependency for credential checks: all reads go to the primary.
+
+    A replica lagging behind would let a just-registered user fail to log in
+    and a just-changed password still authenticate.
+    """
+    pin_primary(db)
+    return db
 
 
 async def get_current_user(
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> User:
@@ -43,10 +49,20 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
+    # Access tokens outlive account deletion; reject them without a query
+    if int(user_id) in deactivated_users:
+        raise inactive_user_exception()
+
+    # Before the first read, so a user who just wrote is served by the primary
+    bind_user(db, int(user_id))
     user = await get_user_by_id(db, int(user_id))
     if user is None:
         raise credentials_exception
+    if not user.is_active:
+        deactivated_users.add(user.id)
 
+    # Exposed to middleware, e.g. to authorize per-request profiling
+    request.state.user = user
     return user
 
 
@@ -55,7 +71,16 @@ async def get_current_active_user(
 ) -> User:
     """Dependency that returns the current active user."""
     if not current_user.is_active:
+        raise inactive_user_exception()
+    return current_user
+
+
+async def get_current_superuser(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> User:
+    """Dependency that returns the current user if they are a superuser."""
+    if not current_user.is_superuser:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges"
         )
     return current_user
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import get_current_superuser
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler, profile_filename
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    current_user: Annotated[User, Depends(get_current_superuser)],
+    seconds: float = Query(10, gt=0, le=60),
+) -> PlainTextResponse:
+    """Sample all threads of this worker and return collapsed stacks."""
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+
+    profiler = SamplingProfiler(interval=settings.profiling_interval_ms / 1000)
+    if not profiler.start():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="A profile is already running"
+        )
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_filename()}"'},
+    )
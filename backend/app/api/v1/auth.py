@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import get_current_active_user, get_primary_db
 from app.core.config import settings
 from app.core.rate_limit import auth_rate_limiter
 from app.models.user import User
@@ -25,7 +25,7 @@ router = APIRouter()
 async def login_for_access_token(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_primary_db)],
 ) -> Token:
     """OAuth2 compatible token login."""
     # 检查速率限制
@@ -53,7 +53,7 @@ async def login_for_access_token(
 async def refresh_token(
     request: Request,
     token_data: RefreshTokenRequest,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_primary_db)],
 ) -> Token:
     """Refresh access token using refresh token."""
     device_info = request.headers.get("user-agent")
@@ -71,9 +71,9 @@ async def refresh_token(
 
 @router.post("/logout")
 async def logout(
+    db: Annotated[AsyncSession, Depends(get_primary_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     token_data: RefreshTokenRequest,
-    db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict:
     """Logout by revoking the refresh token."""
     token_record = await get_refresh_token(db, token_data.refresh_token)
@@ -85,8 +85,8 @@ async def logout(
 
 @router.post("/logout-all")
 async def logout_all_devices(
+    db: Annotated[AsyncSession, Depends(get_primary_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict:
     """Logout from all devices by revoking all refresh tokens."""
     await revoke_all_user_tokens(db, current_user.id)
@@ -96,7 +96,7 @@ async def logout_all_devices(
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_in: UserCreate,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_primary_db)],
 ) -> UserResponse:
     """Register a new user."""
     if not settings.registration_institution_code:
@@ -1,4 +1,10 @@
-from fastapi import APIRouter
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.services.health import check_readiness
 
 router = APIRouter()
 
@@ -10,6 +16,15 @@ async def health_check() -> dict[str, str]:
 
 
 @router.get("/ready")
-async def readiness_check() -> dict[str, str]:
-    """Readiness check endpoint."""
-    return {"status": "ready"}
+async def readiness_check(
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """Readiness check endpoint.
+
+    Probes the database and upload storage; responds 503 if any is failing.
+    """
+    result = await check_readiness(db)
+    if result["status"] != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, health, todos, users
+from app.api.v1 import admin, auth, health, todos, users
 
 api_router = APIRouter()
 
@@ -8,3 +8,4 @@ api_router.include_router(health.router, tags=["health"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(todos.router, prefix="/todos", tags=["todos"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -5,15 +5,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user, get_db
 from app.models.user import User
-from app.schemas.todo import TodoCreate, TodoListResponse, TodoResponse, TodoUpdate
+from app.schemas.todo import (
+    TodoCreate,
+    TodoListResponse,
+    TodoPriorityStats,
+    TodoResponse,
+    TodoStatsResponse,
+    TodoUpdate,
+)
 from app.services.todo import (
     create_todo,
     delete_todo,
     get_todo_by_id,
+    get_todo_for_update,
     get_todos,
     toggle_todo,
     update_todo,
 )
+from app.services.todo_stats import get_todo_stats
 
 router = APIRouter()
 
@@ -25,10 +34,20 @@ async def list_todos(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     completed: bool | None = None,
+    include_archived: bool = False,
 ) -> TodoListResponse:
-    """List todos for current user."""
+    """List todos for current user.
+
+    Archived todos (completed long ago) are read-only and only listed with
+    ``include_archived``.
+    """
     todos, total = await get_todos(
-        db, current_user.id, page=page, page_size=page_size, completed=completed
+        db,
+        current_user.id,
+        page=page,
+        page_size=page_size,
+        completed=completed,
+        include_archived=include_archived,
     )
     total_pages = (total + page_size - 1) // page_size
 
@@ -52,6 +71,31 @@ async def create_new_todo(
     return TodoResponse.model_validate(todo)
 
 
+@router.get("/stats", response_model=TodoStatsResponse)
+async def read_todo_stats(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> TodoStatsResponse:
+    """Count the current user's todos by status and priority."""
+    counts = await get_todo_stats(db, current_user.id)
+    by_priority = [
+        TodoPriorityStats(
+            priority=priority,
+            open=counts.get((False, priority), 0),
+            completed=counts.get((True, priority), 0),
+        )
+        for priority in sorted({priority for _, priority in counts} | {0, 1, 2})
+    ]
+    completed = sum(stats.completed for stats in by_priority)
+    open_ = sum(stats.open for stats in by_priority)
+    return TodoStatsResponse(
+        total=completed + open_,
+        open=open_,
+        completed=completed,
+        by_priority=by_priority,
+    )
+
+
 @router.get("/{todo_id}", response_model=TodoResponse)
 async def get_todo(
     todo_id: int,
@@ -73,7 +117,7 @@ async def update_existing_todo(
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> TodoResponse:
     """Update a todo."""
-    todo = await get_todo_by_id(db, todo_id, current_user.id)
+    todo = await get_todo_for_update(db, todo_id, current_user.id)
     if not todo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo not found")
 
@@ -88,7 +132,7 @@ async def delete_existing_todo(
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> None:
     """Delete a todo."""
-    todo = await get_todo_by_id(db, todo_id, current_user.id)
+    todo = await get_todo_for_update(db, todo_id, current_user.id)
     if not todo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo not found")
 
@@ -102,7 +146,7 @@ async def toggle_todo_status(
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> TodoResponse:
     """Toggle todo completed status."""
-    todo = await get_todo_by_id(db, todo_id, current_user.id)
+    todo = await get_todo_for_update(db, todo_id, current_user.id)
     if not todo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Todo not found")
 
@@ -1,22 +1,54 @@
+import asyncio
+import base64
+import binascii
+import codecs
+import csv
 import uuid
+from collections.abc import AsyncIterator, Iterator
+from contextlib import suppress
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
-import aiofiles
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+import anyio
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import get_current_active_user, get_current_superuser, get_db
+from app.core.config import settings
+from app.core.middleware import RequestBodyTooLarge
+from app.core.storage import UPLOAD_DIR, ensure_upload_dir
 from app.models.user import User
-from app.schemas.user import UserResponse, UserUpdate
-from app.services.user import update_user
+from app.schemas.user import (
+    UserAdminResponse,
+    UserImport,
+    UserImportResult,
+    UserListResponse,
+    UserResponse,
+    UserUpdate,
+)
+from app.services.deactivation import deactivate_user
+from app.services.user import (
+    count_users,
+    import_users,
+    list_users,
+    update_user,
+    user_filters,
+)
 
 router = APIRouter()
 
-UPLOAD_DIR = Path(__file__).parent.parent.parent.parent / "uploads" / "avatars"
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
@@ -44,6 +76,277 @@ def validate_image_content(content: bytes) -> bool:
     return False
 
 
+class UploadStreamingResponse(StreamingResponse):
+    """A streaming response whose body generator is still reading the upload.
+
+    ``StreamingResponse`` watches ``receive`` for client disconnects, which
+    would steal chunks from the request body. Here the listener only starts
+    once ``body_read`` is set; until then the generator reads the body
+    itself and a disconnect ends it with ``ClientDisconnect``. Either way a
+    client that goes away stops the import.
+    """
+
+    def __init__(
+        self,
+        content: AsyncIterator[bytes],
+        body_read: asyncio.Event,
+        status_code: int = 200,
+        media_type: str | None = None,
+    ) -> None:
+        super().__init__(content, status_code=status_code, media_type=media_type)
+        self.body_read = body_read
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        spec_version = tuple(
+            int(part) for part in scope.get("asgi", {}).get("spec_version", "2.0").split(".")
+        )
+        # Servers on ASGI 2.4+ fail the send once the client is gone
+        if spec_version >= (2, 4):
+            with suppress(ClientDisconnect, OSError):
+                await self.stream_response(send)
+            return
+
+        async with anyio.create_task_group() as task_group:
+
+            async def stream() -> None:
+                with suppress(ClientDisconnect):
+                    await self.stream_response(send)
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(stream)
+            await self.body_read.wait()
+            await self.listen_for_disconnect(receive)
+            task_group.cancel_scope.cancel()
+
+
+async def csv_records(
+    request: Request, body_read: asyncio.Event
+) -> AsyncIterator[dict[str, Any]]:
+    """Parse a CSV upload while it streams in, one record at a time.
+
+    The first record names the columns (``email,password,full_name``).
+    ``body_read`` is set once the upload has been received completely.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header: list[str] | None = None
+    buffer = ""
+    # Lines of a record whose quoted field continues on the next line
+    pending: list[str] = []
+    quotes = 0
+
+    def complete() -> Iterator[dict[str, Any]]:
+        nonlocal header, quotes
+        values = next(csv.reader(pending), [])
+        pending.clear()
+        quotes = 0
+        if not values:
+            return
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            return
+        yield {name: value or None for name, value in zip(header, values)}
+
+    def parse(lines: list[str]) -> Iterator[dict[str, Any]]:
+        nonlocal quotes
+        for line in lines:
+            pending.append(line)
+            # An odd number of quotes leaves a quoted field open
+            quotes += line.count('"')
+            if quotes % 2 == 0:
+                yield from complete()
+
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for record in parse([line + "\n" for line in lines]):
+            yield record
+    body_read.set()
+    buffer += decoder.decode(b"", final=True)
+    for record in parse([buffer]):
+        yield record
+    # An unterminated quote runs to the end of the upload
+    if pending:
+        for record in complete():
+            yield record
+
+
+async def json_records(request: Request) -> list[Any]:
+    """Read a JSON array upload; errors surface before the response starts."""
+    try:
+        records = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of users")
+    return records
+
+
+async def iterate(records: list[Any]) -> AsyncIterator[Any]:
+    for record in records:
+        yield record
+
+
+def error_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def import_stream(
+    db: AsyncSession, records: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    """Validate, insert and report rows batch by batch as NDJSON lines."""
+
+    def line(result: UserImportResult) -> bytes:
+        return result.model_dump_json(exclude_none=True).encode() + b"\n"
+
+    seen: set[str] = set()
+    batch: list[tuple[int, UserImport]] = []
+
+    async def flush() -> list[bytes]:
+        created = await import_users(db, [user for _, user in batch])
+        # Commit per batch so every streamed result is durable
+        await db.commit()
+        lines = [
+            line(UserImportResult(
+                row=number,
+                email=user.email,
+                status="created" if user.email in created else "exists",
+                id=created.get(user.email),
+            ))
+            for number, user in batch
+        ]
+        batch.clear()
+        return lines
+
+    number = 0
+    stopped: str | None = None
+    try:
+        async for record in records:
+            number += 1
+            if number > settings.bulk_user_max_rows:
+                stopped = f"Import limit of {settings.bulk_user_max_rows} rows reached"
+                break
+            try:
+                user = UserImport.model_validate(record)
+            except ValidationError as exc:
+                yield line(UserImportResult(row=number, status="invalid", error=error_message(exc)))
+                continue
+            if user.email in seen:
+                yield line(UserImportResult(row=number, email=user.email, status="duplicate"))
+                continue
+            seen.add(user.email)
+            batch.append((number, user))
+            if len(batch) >= settings.bulk_user_batch_size:
+                for result in await flush():
+                    yield result
+    except RequestBodyTooLarge as exc:
+        # Streamed CSV crossed the body limit after the response started;
+        # the rows read so far are kept and the cut-off row is reported
+        number += 1
+        stopped = exc.detail
+    if batch:
+        for result in await flush():
+            yield result
+    if stopped is not None:
+        yield line(UserImportResult(row=number, status="skipped", error=stopped))
+
+
+@router.post(
+    "/bulk",
+    response_class=UploadStreamingResponse,
+    responses={
+        200: {
+            "description": "One result per input row, as newline-delimited JSON",
+            "content": {"application/x-ndjson": {"schema": UserImportResult.model_json_schema()}},
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": UserImport.model_json_schema()}
+                },
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_users(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_superuser)],
+) -> UploadStreamingResponse:
+    """Create many users from a JSON array or a CSV upload (superuser only).
+
+    Emails that already exist are reported and skipped, not overwritten.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body_read = asyncio.Event()
+    if content_type == "text/csv":
+        records = csv_records(request, body_read)
+    elif content_type == "application/json":
+        records = iterate(await json_records(request))
+        body_read.set()
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/json or text/csv",
+        )
+    return UploadStreamingResponse(
+        import_stream(db, records), body_read, media_type="application/x-ndjson"
+    )
+
+
+def encode_cursor(user_id: int) -> str:
+    """Opaque page cursor; clients must not build or interpret it."""
+    return base64.urlsafe_b64encode(f"u{user_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        decoded = ""
+    if not decoded.startswith("u") or not decoded[1:].isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return int(decoded[1:])
+
+
+@router.get("", response_model=UserListResponse)
+async def read_users(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_superuser)],
+    after: str | None = Query(
+        None, max_length=64, description="next_cursor of the previous page"
+    ),
+    limit: int = Query(50, ge=1, le=100),
+    q: str | None = Query(None, min_length=1, max_length=100),
+    is_active: bool | None = None,
+) -> UserListResponse:
+    """List users by id, optionally searching email and name (superuser only).
+
+    Terms of one or two characters match prefixes, longer terms match
+    anywhere.
+    """
+    users, next_id = await list_users(
+        db,
+        after=None if after is None else decode_cursor(after),
+        limit=limit,
+        search=q,
+        is_active=is_active,
+    )
+    total, total_is_estimate = await count_users(db, user_filters(q, is_active))
+    return UserListResponse(
+        items=[UserAdminResponse.model_validate(u) for u in users],
+        next_cursor=None if next_id is None else encode_cursor(next_id),
+        total=total,
+        total_is_estimate=total_is_estimate,
+    )
+
+
 @router.get("/me", response_model=UserResponse)
 async def read_current_user(
     current_user: Annotated[User, Depends(get_current_active_user)],
@@ -68,9 +371,12 @@ async def delete_current_user(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> None:
-    """Delete current user (soft delete by setting is_active to False)."""
-    current_user.is_active = False
-    await db.commit()
+    """Delete current user.
+
+    Sessions end immediately; the account and its data are purged after
+    the grace period (``DEACTIVATED_USER_PURGE_AFTER_DAYS``).
+    """
+    await deactivate_user(db, current_user)
 
 
 @router.post("/me/avatar", response_model=UserResponse)
@@ -108,6 +414,9 @@ async def upload_avatar(
             old_file.unlink()
 
     # Save new avatar
+    import aiofiles
+
+    ensure_upload_dir()
     filename = f"{current_user.id}_{uuid.uuid4().hex[:8]}{ext}"
     filepath = UPLOAD_DIR / filename
 
@@ -117,7 +426,6 @@ async def upload_avatar(
     # Update user avatar URL
     current_user.avatar = f"/api/v1/users/avatar/{filename}"
     await db.commit()
-    await db.refresh(current_user)
 
     return UserResponse.model_validate(current_user)
 
@@ -0,0 +1,222 @@
+"""Per-request database query instrumentation and slow query logging."""
+
+import asyncio
+import hashlib
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, default
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import CACHE_REQUESTS
+
+logger = get_logger(__name__)
+
+# Execution option set on our own EXPLAIN statements so they are not re-examined
+SKIP_SLOW_QUERY_LOG = "skip_slow_query_log"
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class RequestStats:
+    """Query counters accumulated while handling one request."""
+
+    db_queries: int = 0
+    db_time: float = 0.0
+
+    def server_timing(self, total: float) -> str:
+        """Render the counters as a Server-Timing header value."""
+        return (
+            f"app;dur={total * 1000:.2f}, "
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"'
+        )
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats() -> tuple[RequestStats, Token[RequestStats | None]]:
+    """Begin collecting query stats for the current request context."""
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def stop_request_stats(token: Token[RequestStats | None]) -> None:
+    """Stop collecting query stats for the current request context."""
+    _request_stats.reset(token)
+
+
+def current_request_stats() -> RequestStats | None:
+    """Return the stats of the request being handled, if any."""
+    return _request_stats.get()
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Keep numbers, booleans and dates; replace strings and bytes with a size.
+
+    Strings may hold e-mail addresses, password hashes or token digests, so
+    their values never reach the logs.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if isinstance(parameters, (date, datetime)):
+        return parameters.isoformat()
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    if isinstance(parameters, (str, bytes)):
+        return f"<{type(parameters).__name__} len={len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Identify a statement shape independent of IN-list length and spacing."""
+    normalized = _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement.strip()))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+class ExplainCapture:
+    """Decide which slow statements get an EXPLAIN plan captured.
+
+    Each fingerprint is explained at most once per dedup interval, and no
+    more than a fixed number of plans are captured per minute overall.
+    """
+
+    def __init__(self) -> None:
+        self._last_captured: dict[str, float] = {}
+        self._window_start = 0.0
+        self._window_count = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def should_capture(self, fingerprint: str, now: float) -> bool:
+        last = self._last_captured.get(fingerprint)
+        if last is not None and now - last < settings.slow_query_explain_interval_seconds:
+            return False
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_count = 0
+        if self._window_count >= settings.slow_query_explain_max_per_minute:
+            return False
+        self._window_count += 1
+        self._last_captured[fingerprint] = now
+        return True
+
+    def schedule(
+        self, engine: Engine, statement: str, parameters: Any, fingerprint: str
+    ) -> None:
+        """Run EXPLAIN in a background task on a separate connection."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._explain(engine, statement, parameters, fingerprint))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def reset(self) -> None:
+        self._last_captured.clear()
+        self._window_start = 0.0
+        self._window_count = 0
+
+    async def close(self) -> None:
+        """Cancel EXPLAIN captures still running, before the engine goes away."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _explain(
+        self, engine: Engine, statement: str, parameters: Any, fingerprint: str
+    ) -> None:
+        try:
+            async with AsyncEngine(engine).connect() as conn:
+                conn = await conn.execution_options(**{SKIP_SLOW_QUERY_LOG: True})
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off) {statement}", parameters
+                )
+                plan = "\n".join(row[0] for row in result)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("slow_query_explain_failed", fingerprint=fingerprint, error=str(exc))
+            return
+        logger.warning("slow_query_plan", fingerprint=fingerprint, plan=plan)
+
+
+explain_capture = ExplainCapture()
+
+
+def _log_slow_query(
+    conn: Any, statement: str, parameters: Any, executemany: bool, elapsed: float
+) -> None:
+    fingerprint = statement_fingerprint(statement)
+    logger.warning(
+        "slow_query",
+        duration_ms=round(elapsed * 1000, 2),
+        fingerprint=fingerprint,
+        statement=statement,
+        parameters=redact_parameters(parameters),
+    )
+    if (
+        settings.slow_query_explain_enabled
+        and conn.dialect.name == "postgresql"
+        and not executemany
+        and statement.lstrip().upper().startswith(EXPLAINABLE)
+        and explain_capture.should_capture(fingerprint, time.monotonic())
+    ):
+        explain_capture.schedule(conn.engine, statement, parameters, fingerprint)
+
+
+# SQLAlchemy's compiled cache outcome for each executed statement
+_COMPILED_CACHE_RESULTS = {
+    default.CACHE_HIT: "hit",
+    default.CACHE_MISS: "miss",
+    default.CACHING_DISABLED: "disabled",
+    default.NO_CACHE_KEY: "uncacheable",
+    default.NO_DIALECT_SUPPORT: "unsupported",
+}
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    context.query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    elapsed = time.perf_counter() - context.query_start_time
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_time += elapsed
+    CACHE_REQUESTS.inc(
+        "sql_compiled", _COMPILED_CACHE_RESULTS.get(context.cache_hit, "uncacheable")
+    )
+
+    threshold = settings.slow_query_threshold_ms
+    if (
+        threshold is not None
+        and elapsed * 1000 >= threshold
+        and not context.execution_options.get(SKIP_SLOW_QUERY_LOG)
+    ):
+        _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    """Attach query timing and slow query hooks to an engine (idempotent)."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
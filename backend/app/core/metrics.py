@@ -0,0 +1,254 @@
+"""Minimal Prometheus-compatible metrics.
+
+Metrics are plain Python numbers updated from the event loop thread, so
+recording a sample takes no locks. When ``settings.metrics_multiproc_dir`` is
+set, every worker periodically writes a snapshot of its metrics to that
+directory and ``/metrics`` serves the sum over all workers.
+"""
+
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+Labels = tuple[str, ...]
+Collector = Callable[[], Iterable[tuple[Labels, float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """Base class for metrics stored in a registry."""
+
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        collect: Collector | None = None,
+        registry: "Registry | None" = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._collect = collect
+        self._values: dict[Labels, Any] = defaultdict(float)
+        (registry or REGISTRY).register(self)
+
+    def state(self) -> dict[Labels, Any]:
+        """Current values keyed by label values."""
+        if self._collect is not None:
+            return dict(self._collect())
+        return dict(self._values)
+
+    def render(self, state: dict[Labels, Any]) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labels, value in sorted(state.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] += amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or be read from a callback."""
+
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] += amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] -= amount
+
+
+class Histogram(Metric):
+    """Histogram with fixed buckets.
+
+    Each label set stores per-bucket counts (the last slot is ``+Inf``)
+    followed by the sum and count of observations.
+    """
+
+    type = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        registry: "Registry | None" = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [0.0] * (len(self.buckets) + 3)
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+    def render(self, state: dict[Labels, Any]) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        bucket_names = (*self.labelnames, "le")
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for labels, entry in sorted(state.items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, entry):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_names, (*labels, bound))} "
+                    f"{_format_value(cumulative)}"
+                )
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{label_str} {_format_value(entry[-1])}")
+        return lines
+
+
+def _merge(target: dict[Labels, Any], source: dict[Labels, Any]) -> None:
+    for labels, value in source.items():
+        current = target.get(labels)
+        if current is None:
+            target[labels] = list(value) if isinstance(value, list) else value
+        elif isinstance(current, list):
+            target[labels] = [a + b for a, b in zip(current, value)]
+        else:
+            target[labels] = current + value
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        self._metrics[metric.name] = metric
+
+    def snapshot(self) -> dict[str, list]:
+        """JSON-serializable state of every metric in this process."""
+        return {
+            name: [[list(labels), value] for labels, value in metric.state().items()]
+            for name, metric in self._metrics.items()
+        }
+
+    def render(self, snapshots: Iterable[dict[str, list]] = ()) -> str:
+        """Render the Prometheus text format, summed with other snapshots."""
+        states = {name: metric.state() for name, metric in self._metrics.items()}
+        for snapshot in snapshots:
+            for name, entries in snapshot.items():
+                if name in states:
+                    _merge(states[name], {tuple(labels): value for labels, value in entries})
+
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.extend(metric.render(states[name]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ("cache", "result"),
+)
+
+
+def _snapshot_path(directory: str, pid: int) -> Path:
+    return Path(directory) / f"metrics_{pid}.json"
+
+
+def write_snapshot(directory: str) -> None:
+    """Atomically write this worker's metrics to the multiprocess directory."""
+    path = _snapshot_path(directory, os.getpid())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(REGISTRY.snapshot()), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def remove_snapshot(directory: str) -> None:
+    """Remove this worker's snapshot file on shutdown."""
+    _snapshot_path(directory, os.getpid()).unlink(missing_ok=True)
+
+
+def read_snapshots(directory: str, max_age: float) -> list[dict[str, list]]:
+    """Read the snapshots of the other live workers."""
+    own = _snapshot_path(directory, os.getpid())
+    cutoff = time.time() - max_age
+    snapshots = []
+    for path in Path(directory).glob("metrics_*.json"):
+        try:
+            if path == own or path.stat().st_mtime < cutoff:
+                continue
+            snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+async def run_snapshot_writer(directory: str, interval: float) -> None:
+    """Write snapshots every ``interval`` seconds until cancelled."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    try:
+        while True:
+            write_snapshot(directory)
+            await asyncio.sleep(interval)
+    finally:
+        remove_snapshot(directory)
@@ -0,0 +1,267 @@
+"""ASGI middleware for request timing, access logging and body limits."""
+
+import threading
+import time
+import uuid
+from collections.abc import Mapping
+from urllib.parse import parse_qs
+
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.instrumentation import start_request_stats, stop_request_stats
+from app.core.logging import get_logger
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+)
+from app.core.profiling import SamplingProfiler, profile_filename
+from app.core.security import decode_access_token
+from app.services.auth import SUPERUSER_CLAIM
+
+access_logger = get_logger("app.access")
+
+
+def route_template(scope: Scope) -> str:
+    """Return the matched route as a template, e.g. ``/api/v1/todos/{todo_id}``.
+
+    Unmatched paths share one label to keep metric cardinality bounded.
+    """
+    route = scope.get("route")
+    if route is None:
+        # Plain Starlette routes (the docs pages) only set "endpoint" and
+        # take no parameters
+        return "<unmatched>" if scope.get("endpoint") is None else scope["path"]
+    # The template comes from the matched route, never from parameter
+    # values. Routes of an included router may only know their own part
+    # of the path, so the request path in front of it is the prefix.
+    template: str = route.path
+    depth = template.count("/")
+    prefix = scope["path"].rsplit("/", depth)[0] if depth else scope["path"]
+    return prefix + template
+
+
+def route_path(scope: Scope) -> str:
+    """Return the request path as the app's routes see it.
+
+    Middleware runs before routing, so the mount prefix (``root_path``)
+    and a trailing slash are removed here instead.
+    """
+    path: str = scope["path"]
+    root_path: str = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    return path.rstrip("/") or "/"
+
+
+class RequestBodyTooLarge(HTTPException):
+    """Raised while reading a request body that crosses its size limit."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(
+            status_code=413,
+            detail=f"Request body exceeds {limit} bytes",
+            headers={"Connection": "close"},
+        )
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies above a per-path size limit.
+
+    A ``Content-Length`` over the limit is answered with 413 before a byte of
+    the body is read. Other bodies (chunked uploads) are counted as they
+    stream in and reading fails with ``RequestBodyTooLarge`` as soon as the
+    limit is crossed, so nothing larger is ever buffered or parsed. Paths in
+    ``limits`` override the default.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_limit: int | None = None,
+        limits: Mapping[str, int] | None = None,
+    ) -> None:
+        self.app = app
+        self.default_limit = (
+            settings.max_request_body_size if default_limit is None else default_limit
+        )
+        self.limits = limits or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get(route_path(scope), self.default_limit)
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self.reject(RequestBodyTooLarge(limit), scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise RequestBodyTooLarge(limit)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestBodyTooLarge as exc:
+            # Routes turn it into a 413 themselves; this catches the rest
+            if response_started:
+                raise
+            await self.reject(exc, scope, receive, send)
+
+    @staticmethod
+    async def reject(
+        exc: RequestBodyTooLarge, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        response = JSONResponse(
+            {"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers
+        )
+        await response(scope, receive, send)
+
+
+class RequestTimingMiddleware:
+    """Bind a request id, time the request and count its database queries.
+
+    The totals are returned in a ``Server-Timing`` header, written as one
+    structured access log line per request and recorded in the request
+    metrics, keyed by route template.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or uuid.uuid4().hex
+        stats, stats_token = start_request_stats()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        start = time.perf_counter()
+        status_code = 500
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                if settings.server_timing_enabled:
+                    headers.append(
+                        "Server-Timing", stats.server_timing(time.perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - start
+            route = route_template(scope)
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUESTS.inc(scope["method"], route, str(status_code))
+            HTTP_REQUEST_DURATION.observe(duration, scope["method"], route)
+            if settings.access_log_enabled:
+                access_logger.info(
+                    "request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=route,
+                    status=status_code,
+                    duration_ms=round(duration * 1000, 2),
+                    db_queries=stats.db_queries,
+                    db_ms=round(stats.db_time * 1000, 2),
+                )
+            structlog.contextvars.unbind_contextvars("request_id")
+            stop_request_stats(stats_token)
+
+
+def claims_superuser(scope: Scope) -> bool:
+    """Whether the request's bearer token carries the superuser claim."""
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = decode_access_token(token)
+    return payload is not None and payload.get(SUPERUSER_CLAIM) is True
+
+
+class ProfilingMiddleware:
+    """Profile a single request when called with ``?profile=1``.
+
+    Only requests whose token claims a superuser start the sampler; all
+    others pass through untouched. The event loop thread is sampled while
+    the request runs and, if the authenticated user is still a superuser,
+    the response is replaced by the collapsed stacks. Other requests running
+    concurrently on the same worker show up in the samples.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.profiling_enabled
+            or parse_qs(scope["query_string"].decode()).get("profile") != ["1"]
+            or not claims_superuser(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(
+            interval=settings.profiling_interval_ms / 1000,
+            thread_id=threading.get_ident(),
+        )
+        if not profiler.start():
+            await self.app(scope, receive, send)
+            return
+
+        messages: list[Message] = []
+
+        async def buffer(message: Message) -> None:
+            messages.append(message)
+
+        try:
+            await self.app(scope, receive, buffer)
+        finally:
+            profiler.stop()
+
+        # The claim may be stale; only the loaded user is authoritative
+        user = scope.get("state", {}).get("user")
+        if user is not None and user.is_active and user.is_superuser:
+            status_code = next(
+                m["status"] for m in messages if m["type"] == "http.response.start"
+            )
+            response = PlainTextResponse(
+                profiler.collapsed(),
+                headers={
+                    "Content-Disposition": f'attachment; filename="{profile_filename()}"',
+                    "X-Profiled-Status": str(status_code),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        for message in messages:
+            await send(message)
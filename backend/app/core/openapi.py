@@ -0,0 +1,161 @@
+"""Pre-serialized OpenAPI document.
+
+The schema is built once per process (or loaded from the committed
+``openapi.json`` when its source fingerprint still matches) and served as
+ready-made bytes, so no worker pays for ``app.openapi()`` on a request.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import HTMLResponse, Response
+
+from app.core.compression import negotiate, precompress
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+OPENAPI_PATH = BACKEND_DIR / "openapi.json"
+FINGERPRINT_PATH = BACKEND_DIR / "openapi.fingerprint"
+
+# Everything that can change the generated schema
+SOURCE_PATHS = ("app/main.py", "app/api", "app/schemas")
+
+
+@dataclass(frozen=True)
+class OpenAPIDocument:
+    """Serialized schema plus its precompressed variants."""
+
+    schema: dict[str, Any]
+    body: bytes
+    variants: dict[str, bytes]
+    etag: str
+
+    @classmethod
+    def from_schema(cls, schema: dict[str, Any]) -> "OpenAPIDocument":
+        body = json.dumps(schema, separators=(",", ":"), ensure_ascii=False).encode()
+        return cls(
+            schema=schema,
+            body=body,
+            variants=precompress(body),
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+
+
+def source_fingerprint(app: FastAPI) -> str:
+    """Hash the API sources and the library versions that shape the schema."""
+    import fastapi
+    import pydantic
+
+    digest = hashlib.sha256()
+    for part in (fastapi.__version__, pydantic.VERSION, app.title, app.version):
+        digest.update(part.encode())
+        digest.update(b"\0")
+
+    files: list[Path] = []
+    for source in SOURCE_PATHS:
+        path = BACKEND_DIR / source
+        files.extend(sorted(path.rglob("*.py")) if path.is_dir() else [path])
+    for file in files:
+        digest.update(file.relative_to(BACKEND_DIR).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def load_committed_schema(fingerprint: str) -> dict[str, Any] | None:
+    """Return the committed schema if it was exported from the same sources."""
+    try:
+        if FINGERPRINT_PATH.read_text().strip() != fingerprint:
+            return None
+        return json.loads(OPENAPI_PATH.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def export_schema(app: FastAPI) -> Path:
+    """Write ``openapi.json`` and its fingerprint sidecar."""
+    schema = app.openapi()
+    with open(OPENAPI_PATH, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+    FINGERPRINT_PATH.write_text(source_fingerprint(app) + "\n")
+    return OPENAPI_PATH
+
+
+_document: OpenAPIDocument | None = None
+
+
+def build_openapi_document(app: FastAPI) -> OpenAPIDocument:
+    """Build (or load) the document once and cache it for this process."""
+    global _document
+    if _document is None:
+        schema = load_committed_schema(source_fingerprint(app))
+        if schema is None:
+            schema = app.openapi()
+        else:
+            # Keep app.openapi() consistent with what is served
+            app.openapi_schema = schema
+        _document = OpenAPIDocument.from_schema(schema)
+    return _document
+
+
+def reset_openapi_document() -> None:
+    """Drop the cached document (used by tests)."""
+    global _document
+    _document = None
+
+
+def register_docs_routes(
+    app: FastAPI,
+    openapi_url: str,
+    docs_url: str,
+    redoc_url: str,
+    oauth2_redirect_url: str = "/docs/oauth2-redirect",
+) -> None:
+    """Serve the cached document and the Swagger UI / ReDoc pages."""
+
+    async def openapi(request: Request) -> Response:
+        document = build_openapi_document(app)
+        headers = {
+            "ETag": document.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if document.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        body = document.body
+        encoding = negotiate(request.headers.get("accept-encoding", ""), document.variants)
+        if encoding is not None:
+            body = document.variants[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="application/json", headers=headers)
+
+    async def swagger_ui_html(request: Request) -> HTMLResponse:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_swagger_ui_html(
+            openapi_url=root_path + openapi_url,
+            title=f"{app.title} - Swagger UI",
+            oauth2_redirect_url=root_path + oauth2_redirect_url,
+        )
+
+    async def swagger_ui_redirect(request: Request) -> HTMLResponse:
+        return get_swagger_ui_oauth2_redirect_html()
+
+    async def redoc_html(request: Request) -> HTMLResponse:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_redoc_html(
+            openapi_url=root_path + openapi_url, title=f"{app.title} - ReDoc"
+        )
+
+    app.add_route(openapi_url, openapi, include_in_schema=False)
+    app.add_route(docs_url, swagger_ui_html, include_in_schema=False)
+    app.add_route(oauth2_redirect_url, swagger_ui_redirect, include_in_schema=False)
+    app.add_route(redoc_url, redoc_html, include_in_schema=False)
@@ -0,0 +1,85 @@
+"""Statistical sampling profiler producing collapsed stacks.
+
+The output is the "collapsed" format understood by flamegraph.pl,
+speedscope and similar tools: one line per distinct stack, frames joined
+with ``;`` from the root, followed by the number of samples.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sample thread stacks from a background thread at a fixed interval.
+
+    Args:
+        interval: Seconds between samples.
+        thread_id: Only sample this thread; by default all other threads are
+            sampled and prefixed with the thread name.
+    """
+
+    # Only one profiler may run per worker at a time
+    _active = threading.Lock()
+
+    def __init__(self, interval: float = 0.005, thread_id: int | None = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> bool:
+        """Start sampling; returns False if another profile is running."""
+        if not self._active.acquire(blocking=False):
+            return False
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._active.release()
+
+    def collapsed(self) -> str:
+        """Render the samples in collapsed-stack format."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_id is not None and thread_id != self.thread_id:
+                    continue
+                stack = []
+                current: FrameType | None = frame
+                while current is not None:
+                    stack.append(_frame_label(current))
+                    current = current.f_back
+                if self.thread_id is None:
+                    if thread_id not in names:
+                        names = {t.ident: t.name for t in threading.enumerate()}
+                    stack.append(f"thread:{names.get(thread_id, thread_id)}")
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def profile_filename() -> str:
+    return f"profile-{os.getpid()}.collapsed"
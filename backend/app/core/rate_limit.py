@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 
 from fastapi import HTTPException, Request, status
 
+from app.core.metrics import Gauge
+
 
 @dataclass
 class RateLimitEntry:
@@ -123,6 +125,14 @@ class RateLimiter:
             self._blocked[client_ip] = current_time
             del self._entries[client_ip]
 
+    def table_sizes(self) -> dict[str, int]:
+        """Number of tracked and blocked clients."""
+        return {"attempts": len(self._entries), "blocked": len(self._blocked)}
+
+    def reset(self) -> None:
+        """Forget all tracked and blocked clients."""
+        self._entries.clear()
+        self._blocked.clear()
 
 # Global rate limiter instance for auth endpoints
 auth_rate_limiter = RateLimiter(
@@ -130,3 +140,10 @@ auth_rate_limiter = RateLimiter(
     window_seconds=300,  # within 5 minutes
     block_seconds=900,  # block for 15 minutes
 )
+
+RATE_LIMITER_ENTRIES = Gauge(
+    "auth_rate_limiter_entries",
+    "Entries held by the auth rate limiter, by table.",
+    ("table",),
+    collect=lambda: [((table,), size) for table, size in auth_rate_limiter.table_sizes().items()],
+)
@@ -0,0 +1,187 @@
+"""In-process scheduler for periodic maintenance jobs."""
+
+import asyncio
+import random
+import time
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logging import get_logger
+from app.core.metrics import Counter, Histogram
+
+logger = get_logger(__name__)
+
+JobFunc = Callable[[], Awaitable[int | None]]
+
+JOB_RUNS = Counter(
+    "maintenance_job_runs_total",
+    "Maintenance job runs by job and outcome.",
+    ("job", "outcome"),
+)
+JOB_DURATION = Histogram(
+    "maintenance_job_duration_seconds",
+    "Maintenance job run time.",
+    ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+
+@dataclass
+class JobStats:
+    """Duration and outcome metrics for a scheduled job."""
+
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_duration: float = 0.0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_result: int | None = None
+    last_run_at: float | None = None
+
+    def record(self, duration: float, result: int | None, failed: bool = False) -> None:
+        """Record a finished run."""
+        self.runs += 1
+        if failed:
+            self.failures += 1
+        self.last_duration = duration
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.last_result = result
+        self.last_run_at = time.time()
+
+
+@dataclass
+class Job:
+    """A registered periodic job."""
+
+    name: str
+    func: JobFunc
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    stats: JobStats = field(default_factory=JobStats)
+
+    @property
+    def lock_key(self) -> int:
+        """Stable advisory lock key derived from the job name."""
+        return zlib.crc32(f"job:{self.name}".encode())
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next run, including random jitter."""
+        return self.interval_seconds + random.uniform(0, self.jitter_seconds)
+
+
+class Scheduler:
+    """Run registered jobs on fixed intervals with jitter.
+
+    On PostgreSQL each run is guarded by a session-level advisory lock, so when
+    several workers share a database only one of them executes a given job at
+    a time. Other dialects run without a lock.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, Job] = {}
+        self._engine: AsyncEngine | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def register(
+        self,
+        name: str,
+        func: JobFunc,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+    ) -> Job:
+        """Register (or replace) a job under the given name."""
+        job = Job(
+            name=name,
+            func=func,
+            interval_seconds=interval_seconds,
+            jitter_seconds=jitter_seconds,
+        )
+        self.jobs[name] = job
+        return job
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self, engine: AsyncEngine) -> None:
+        """Start a background task per registered job."""
+        if self.running:
+            return
+        self._engine = engine
+        for job in self.jobs.values():
+            self._tasks.append(
+                asyncio.create_task(self._run_forever(job), name=f"job:{job.name}")
+            )
+
+    async def stop(self) -> None:
+        """Cancel all job tasks and wait for them to finish."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def run_job(self, job: Job) -> None:
+        """Run a job once if this worker holds its lock, recording metrics."""
+        async with self._single_runner(job) as acquired:
+            if not acquired:
+                job.stats.skipped += 1
+                JOB_RUNS.inc(job.name, "skipped")
+                return
+
+            start = time.perf_counter()
+            try:
+                result = await job.func()
+            except Exception:
+                duration = time.perf_counter() - start
+                job.stats.record(duration, None, failed=True)
+                JOB_RUNS.inc(job.name, "failure")
+                JOB_DURATION.observe(duration, job.name)
+                logger.exception("job_failed", job=job.name)
+                return
+
+            duration = time.perf_counter() - start
+            job.stats.record(duration, result)
+            JOB_RUNS.inc(job.name, "success")
+            JOB_DURATION.observe(duration, job.name)
+            logger.info(
+                "job_finished",
+                job=job.name,
+                duration_ms=round(duration * 1000, 2),
+                result=result,
+            )
+
+    async def _run_forever(self, job: Job) -> None:
+        # Stagger the first run so workers booting together do not collide
+        await asyncio.sleep(random.uniform(0, job.jitter_seconds))
+        while True:
+            await self.run_job(job)
+            await asyncio.sleep(job.next_delay())
+
+    @asynccontextmanager
+    async def _single_runner(self, job: Job) -> AsyncIterator[bool]:
+        if self._engine is None or self._engine.dialect.name != "postgresql":
+            yield True
+            return
+
+        async with self._engine.connect() as conn:
+            acquired = await conn.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": job.lock_key}
+            )
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    await conn.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": job.lock_key}
+                    )
+
+
+# Global scheduler instance, started from the application lifespan
+scheduler = Scheduler()
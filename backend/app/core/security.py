@@ -1,21 +1,141 @@
+import asyncio
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import hashlib
+import multiprocessing
+import os
 import uuid
-
-import bcrypt
-from jose import JWTError, jwt
+from types import ModuleType
 
 from app.core.config import settings
+from app.core.metrics import Gauge
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+_password_executor: ThreadPoolExecutor | None = None
+
+
+def _password_pool() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt"
+        )
+    return _password_executor
+
+
+# Bulk imports hash thousands of passwords at once; a separate process pool
+# keeps them from queueing in front of interactive logins
+_bulk_hash_executor: ProcessPoolExecutor | None = None
+
+
+def _bulk_hash_pool() -> ProcessPoolExecutor:
+    global _bulk_hash_executor
+    if _bulk_hash_executor is None:
+        _bulk_hash_executor = ProcessPoolExecutor(
+            max_workers=settings.bulk_hash_processes,
+            # fork is unsafe once the event loop and thread pools exist
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _bulk_hash_executor
+
+
+def shutdown_password_pool() -> None:
+    """Stop the hashing threads and processes; new pools are created on next use."""
+    global _password_executor, _bulk_hash_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+    if _bulk_hash_executor is not None:
+        _bulk_hash_executor.shutdown(wait=False, cancel_futures=True)
+        _bulk_hash_executor = None
+
+
+def _forget_password_pool() -> None:
+    # Threads and pool pipes do not survive fork; the child builds its own pools
+    global _password_executor, _bulk_hash_executor
+    _password_executor = None
+    _bulk_hash_executor = None
+
+
+os.register_at_fork(after_in_child=_forget_password_pool)
+
+
+def _password_queue_depth() -> list[tuple[tuple[str, ...], float]]:
+    queue = _password_executor._work_queue.qsize() if _password_executor else 0
+    return [((), queue)]
+
+
+PASSWORD_HASH_QUEUE = Gauge(
+    "password_hash_queue_depth",
+    "bcrypt jobs waiting for a password hashing thread.",
+    collect=_password_queue_depth,
+)
+
+
+# bcrypt and jose are imported on first use to keep worker start-up fast
+def _bcrypt() -> ModuleType:
+    import bcrypt
+
+    return bcrypt
+
+
+def _jwt() -> ModuleType:
+    from jose import jwt
+
+    return jwt
+
+
+def preload_crypto() -> None:
+    """Import bcrypt and jose now, e.g. in a pre-fork master process."""
+    _bcrypt()
+    _jwt()
 
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
+    bcrypt = _bcrypt()
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(password.encode(), salt).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
-    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    return _bcrypt().checkpw(plain_password.encode(), hashed_password.encode())
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool(), hash_password, password)
+
+
+def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """Hash a chunk of passwords (runs in a bulk hashing process)."""
+    return [hash_password(password) for password in passwords]
+
+
+async def hash_passwords_bulk(passwords: Sequence[str]) -> list[str]:
+    """Hash many passwords in parallel on the bulk hashing process pool."""
+    if not passwords:
+        return []
+    loop = asyncio.get_running_loop()
+    pool = _bulk_hash_pool()
+    # One chunk per process keeps pickling overhead to a message per worker
+    size = -(-len(passwords) // settings.bulk_hash_processes)
+    chunks = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, hash_passwords, chunk) for chunk in chunks)
+    )
+    return [hashed for chunk in results for hashed in chunk]
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_pool(), verify_password, plain_password, hashed_password
+    )
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -28,19 +148,20 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
             minutes=settings.jwt_access_token_expire_minutes
         )
     to_encode.update({"exp": expire})
-    return jwt.encode(
+    return _jwt().encode(
         to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
     )
 
 
 def decode_access_token(token: str) -> dict | None:
     """Decode and validate a JWT access token."""
+    jwt = _jwt()
     try:
         payload = jwt.decode(
             token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
         )
         return payload
-    except JWTError:
+    except jwt.JWTError:
         return None
 
 
@@ -58,18 +179,25 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
         expire = datetime.now(timezone.utc) + timedelta(
             days=settings.jwt_refresh_token_expire_days
         )
-    to_encode.update({"exp": expire})
-    return jwt.encode(
+    # A unique jti keeps tokens minted in the same second distinct
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    return _jwt().encode(
         to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
     )
 
 
+def hash_token(token: str) -> bytes:
+    """Return the SHA-256 digest used to store and look up a refresh token."""
+    return hashlib.sha256(token.encode()).digest()
+
+
 def decode_refresh_token(token: str) -> dict | None:
     """Decode and validate a JWT refresh token."""
+    jwt = _jwt()
     try:
         payload = jwt.decode(
             token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
         )
         return payload
-    except JWTError:
+    except jwt.JWTError:
         return None
@@ -0,0 +1,9 @@
+from pathlib import Path
+
+# Directory where uploaded avatars are stored
+UPLOAD_DIR = Path(__file__).parent.parent.parent / "uploads" / "avatars"
+
+
+def ensure_upload_dir() -> None:
+    """Create the upload directory if it does not exist."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
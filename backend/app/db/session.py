@@ -1,35 +1,292 @@
+import itertools
+import os
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.logging import get_logger
+from app.core.metrics import Gauge
+
+logger = get_logger(__name__)
+
+# Created by init_engine() in the application lifespan, so importing this
+# module stays cheap and no connection pool exists before the worker starts.
+engine: AsyncEngine | None = None
+
+# Session.info keys
+PIN_PRIMARY = "pin_primary"
+WROTE = "wrote"
+USER_ID = "user_id"
+
+
+class ReplicaSet:
+    """Read replicas used round-robin.
+
+    A replica whose connection fails is ejected for a while and comes back
+    automatically afterwards; with none left, reads go to the primary.
+    """
+
+    def __init__(self, engines: list[AsyncEngine] | None = None) -> None:
+        self.engines = engines or []
+        self._ejected_until: dict[AsyncEngine, float] = {}
+        self._cycle = itertools.count()
+        for replica in self.engines:
+            event.listen(replica.sync_engine, "handle_error", self._make_error_handler(replica))
+
+    def _make_error_handler(self, replica: AsyncEngine) -> Any:
+        def on_error(context: ExceptionContext) -> None:
+            # No connection means connecting itself failed
+            if context.is_disconnect or context.connection is None:
+                self.eject(replica)
+
+        return on_error
+
+    def choose(self) -> AsyncEngine | None:
+        """Return the next healthy replica, or None to use the primary."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            replica = self.engines[next(self._cycle) % len(self.engines)]
+            if self._ejected_until.get(replica, 0.0) <= now:
+                return replica
+        return None
+
+    def eject(self, replica: AsyncEngine) -> None:
+        self._ejected_until[replica] = (
+            time.monotonic() + settings.database_replica_ejection_seconds
+        )
+        logger.warning("replica_ejected", replica=replica.url.render_as_string())
+
+    def is_ejected(self, replica: AsyncEngine) -> bool:
+        return self._ejected_until.get(replica, 0.0) > time.monotonic()
+
+    def healthy(self) -> int:
+        now = time.monotonic()
+        return sum(1 for r in self.engines if self._ejected_until.get(r, 0.0) <= now)
+
+
+replicas = ReplicaSet()
+
+
+class RecentWriters:
+    """Users who wrote within the read-your-writes window.
+
+    Kept per process: with several workers a user's next request may land on
+    a worker that has not seen the write, so the window should cover typical
+    replication lag rather than rely on this alone.
+    """
+
+    def __init__(self) -> None:
+        self._until: dict[int, float] = {}
+
+    def record(self, user_id: int) -> None:
+        now = time.monotonic()
+        if len(self._until) > 10_000:
+            self._until = {u: t for u, t in self._until.items() if t > now}
+        self._until[user_id] = now + settings.read_your_writes_seconds
+
+    def wrote_recently(self, user_id: int) -> bool:
+        return self._until.get(user_id, 0.0) > time.monotonic()
+
+    def clear(self) -> None:
+        self._until.clear()
+
+
+recent_writers = RecentWriters()
+
+
+class RoutingSession(Session):
+    """Send plain SELECTs to a read replica when replicas are configured.
+
+    Flushes, DML, raw SQL and ``SELECT ... FOR UPDATE`` use the primary.
+    After the first write every later statement in the session does too,
+    so a request always reads its own writes. A statement that fails
+    because its replica is unreachable is retried on the next healthy
+    replica, or on the primary.
+    """
+
+    _replica: AsyncEngine | None = None
+
+    def _execute_internal(self, statement: Any, *args: Any, **kw: Any) -> Any:
+        # execute(), scalar() and scalars() all run statements through here
+        while True:
+            try:
+                return super()._execute_internal(statement, *args, **kw)
+            except DBAPIError:
+                # The error handler ejects a replica it could not reach
+                if self._replica is None or not replicas.is_ejected(self._replica):
+                    raise
+                self._release(self._replica)
+                self._replica = None
+
+    def _release(self, replica: AsyncEngine) -> None:
+        # Drop the dead replica's connection from the session transaction,
+        # so neither the retry nor the commit touches it again
+        trans = self._transaction
+        while trans is not None:
+            entry = trans._connections.pop(replica.sync_engine, None)
+            if entry is not None:
+                conn = entry[0]
+                trans._connections.pop(conn, None)
+                conn.invalidate()
+                conn.close()
+            trans = trans._parent
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:
+        primary = super().get_bind(mapper, clause=clause, **kw)
+        if not replicas.engines or self.info.get(PIN_PRIMARY):
+            return primary
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[PIN_PRIMARY] = self.info[WROTE] = True
+            return primary
+        if not getattr(clause, "is_select", False) or getattr(
+            clause, "_for_update_arg", None
+        ) is not None:
+            return primary
+
+        # Stick to one replica per session for a consistent snapshot
+        if self._replica is None:
+            self._replica = replicas.choose()
+        if self._replica is None:
+            return primary
+        return self._replica.sync_engine
 
-# Convert sync URL to async if needed
-database_url = settings.database_url
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
-elif database_url.startswith("postgresql+psycopg://"):
-    pass  # Already async compatible
-
-engine = create_async_engine(
-    database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-)
 
 AsyncSessionLocal = async_sessionmaker(
-    engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
 
+def _async_url(database_url: str) -> str:
+    # Convert sync URL to async if needed
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return database_url
+
+
+def get_database_url() -> str:
+    """Return the configured database URL with an async driver."""
+    return _async_url(settings.database_url)
+
+
+def _connect_args(url: str) -> dict[str, Any]:
+    # psycopg switches to a server-side prepared statement once a query has
+    # run this many times on a connection
+    if make_url(url).get_driver_name() == "psycopg":
+        return {"prepare_threshold": settings.database_prepare_threshold}
+    return {}
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    created = create_async_engine(
+        url, echo=settings.debug, pool_pre_ping=True, connect_args=_connect_args(url)
+    )
+    instrument_engine(created)
+    return created
+
+
+def init_engine() -> AsyncEngine:
+    """Create the engine and bind the session factory to it (idempotent)."""
+    global engine, replicas
+    if engine is None:
+        engine = _create_engine(get_database_url())
+        replicas = ReplicaSet(
+            [_create_engine(_async_url(url)) for url in settings.database_replica_urls]
+        )
+        AsyncSessionLocal.configure(bind=engine)
+    return engine
+
+
+def pin_primary(session: AsyncSession) -> None:
+    """Send every statement of the session to the primary."""
+    session.info[PIN_PRIMARY] = True
+
+
+def bind_user(session: AsyncSession, user_id: int) -> None:
+    """Tie the session to a user; recent writers read from the primary."""
+    session.info[USER_ID] = user_id
+    if recent_writers.wrote_recently(user_id):
+        session.info[PIN_PRIMARY] = True
+
+
+def get_engine() -> AsyncEngine:
+    """Return the engine, creating it on first use outside the lifespan."""
+    return engine if engine is not None else init_engine()
+
+
+async def dispose_engine() -> None:
+    """Close all pooled connections and drop the engine."""
+    global engine, replicas
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+        AsyncSessionLocal.configure(bind=None)
+    for replica in replicas.engines:
+        await replica.dispose()
+    replicas = ReplicaSet()
+
+
+def _discard_inherited_pool() -> None:
+    # Sockets inherited over fork belong to the parent; drop them unclosed
+    # so the child opens its own connections instead of sharing them.
+    for inherited in ([engine] if engine is not None else []) + replicas.engines:
+        inherited.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_discard_inherited_pool)
+
+
+def _pool_usage() -> list[tuple[tuple[str, ...], float]]:
+    pool = engine.pool if engine is not None else None
+    # Only queue pools track usage (SQLite in-memory engines use others)
+    if not isinstance(pool, QueuePool):
+        return []
+    return [
+        (("checked_out",), pool.checkedout()),
+        (("idle",), pool.checkedin()),
+        (("overflow",), max(pool.overflow(), 0)),
+        (("size",), pool.size()),
+    ]
+
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database connection pool usage by state.",
+    ("state",),
+    collect=_pool_usage,
+)
+
+DB_REPLICAS_HEALTHY = Gauge(
+    "db_replicas_healthy",
+    "Read replicas currently receiving traffic.",
+    collect=lambda: [((), replicas.healthy())],
+)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session."""
+    get_engine()
     async with AsyncSessionLocal() as session:
         try:
             yield session
             await session.commit()
+            if session.info.get(WROTE) and USER_ID in session.info:
+                recent_writers.record(session.info[USER_ID])
         except Exception:
             await session.rollback()
             raise
@@ -1,13 +1,54 @@
-from contextlib import asynccontextmanager
+import asyncio
+import gc
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-import sentry_sdk
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.api.v1.router import api_router
+from app.api.v1.users import MAX_FILE_SIZE
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.instrumentation import explain_capture
 from app.core.logging import setup_logging
+from app.core.metrics import CONTENT_TYPE, REGISTRY, read_snapshots, run_snapshot_writer
+from app.core.middleware import (
+    BodySizeLimitMiddleware,
+    ProfilingMiddleware,
+    RequestTimingMiddleware,
+)
+from app.core.openapi import build_openapi_document, register_docs_routes
+from app.core.rate_limit import auth_rate_limiter
+from app.core.scheduler import scheduler
+from app.core.security import preload_crypto, shutdown_password_pool
+from app.core.storage import ensure_upload_dir
+from app.db.session import dispose_engine, init_engine
+from app.services.deactivation import deactivated_users
+from app.services.health import readiness_cache
+from app.services.maintenance import register_maintenance_jobs
+
+
+def init_worker() -> AsyncEngine:
+    """Create this worker's engine, pools and caches.
+
+    Runs in the lifespan, i.e. inside the worker process after any fork, so
+    no connection, thread or per-process counter is inherited from a master.
+    """
+    auth_rate_limiter.reset()
+    readiness_cache.clear()
+    explain_capture.reset()
+    deactivated_users.clear()
+    return init_engine()
+
+
+async def shutdown_worker() -> None:
+    """Release everything init_worker() and request handling created."""
+    await explain_capture.close()
+    shutdown_password_pool()
+    await dispose_engine()
 
 
 @asynccontextmanager
@@ -17,25 +58,57 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     setup_logging()
 
     if settings.sentry_dsn:
+        import sentry_sdk
+
         sentry_sdk.init(
             dsn=settings.sentry_dsn,
             traces_sample_rate=1.0 if settings.debug else 0.1,
         )
 
+    engine = init_worker()
+    ensure_upload_dir()
+    # Already built if the master preloaded the app
+    build_openapi_document(app)
+
+    if settings.maintenance_enabled:
+        register_maintenance_jobs(scheduler)
+        await scheduler.start(engine)
+
+    metrics_writer = None
+    if settings.metrics_multiproc_dir:
+        metrics_writer = asyncio.create_task(
+            run_snapshot_writer(
+                settings.metrics_multiproc_dir, settings.metrics_flush_interval_seconds
+            )
+        )
+
     yield
 
     # Shutdown
-    pass
+    await scheduler.stop()
+    if metrics_writer:
+        metrics_writer.cancel()
+        await asyncio.gather(metrics_writer, return_exceptions=True)
+    await shutdown_worker()
 
 
 app = FastAPI(
     title=settings.app_name,
-    openapi_url="/api/v1/openapi.json",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
+    # Served from a pre-serialized document, see register_docs_routes below
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
     lifespan=lifespan,
 )
 
+# Request body limits, innermost so 413 responses still carry CORS headers.
+# Uploads get room for the file plus multipart framing.
+BODY_SIZE_LIMITS = {
+    "/api/v1/users/me/avatar": MAX_FILE_SIZE + 64 * 1024,
+    "/api/v1/users/bulk": settings.bulk_user_max_body_size,
+}
+app.add_middleware(BodySizeLimitMiddleware, limits=BODY_SIZE_LIMITS)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -45,11 +118,56 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With"],
 )
 
+# Per-request profiling for superusers (?profile=1), disabled by default
+app.add_middleware(ProfilingMiddleware)
+
+# Response compression (already-encoded responses such as openapi.json pass through)
+app.add_middleware(CompressionMiddleware)
+
+# Request timing middleware (outermost, so it also times CORS handling)
+app.add_middleware(RequestTimingMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+register_docs_routes(
+    app,
+    openapi_url="/api/v1/openapi.json",
+    docs_url="/api/docs",
+    redoc_url="/api/redoc",
+)
+
 
 @app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint."""
     return {"message": f"Welcome to {settings.app_name}"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    if not settings.metrics_enabled:
+        return Response(status_code=404)
+
+    snapshots = []
+    if settings.metrics_multiproc_dir:
+        # Snapshots older than a few flush intervals belong to dead workers
+        snapshots = read_snapshots(
+            settings.metrics_multiproc_dir, settings.metrics_flush_interval_seconds * 3
+        )
+    return Response(REGISTRY.render(snapshots), media_type=CONTENT_TYPE)
+
+
+def preload() -> None:
+    """Build shared read-only state in a pre-fork master (see gunicorn.conf.py).
+
+    Forked workers share these pages copy-on-write. ``gc.freeze`` moves them
+    out of the collector's reach, so collections in the workers do not write
+    to (and thereby copy) them.
+    """
+    build_openapi_document(app)
+    preload_crypto()
+
+    gc.collect()
+    gc.freeze()
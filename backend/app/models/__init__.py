@@ -1,6 +1,8 @@
 from app.models.base import Base
 from app.models.refresh_token import RefreshToken
 from app.models.todo import Todo
+from app.models.todo_archive import TodoArchive
+from app.models.todo_stats import TodoStats
 from app.models.user import User
 
-__all__ = ["Base", "RefreshToken", "Todo", "User"]
+__all__ = ["Base", "RefreshToken", "Todo", "TodoArchive", "TodoStats", "User"]
@@ -0,0 +1,21 @@
+from sqlalchemy import Boolean, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class TodoStats(Base):
+    """Number of a user's todos per completed state and priority.
+
+    Maintained incrementally by the todo services in the same transaction as
+    the change, so reading a user's totals never scans the todos table.
+    """
+
+    __tablename__ = "todo_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    completed: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    priority: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
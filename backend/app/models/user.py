@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, DateTime, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -14,6 +15,17 @@ class User(Base, TimestampMixin):
     """User model."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Only deactivated accounts are indexed, for the purge job
+        Index(
+            "ix_users_deactivated_at",
+            "deactivated_at",
+            postgresql_where=text("deactivated_at IS NOT NULL"),
+            sqlite_where=text("deactivated_at IS NOT NULL"),
+        ),
+    )
+    # On PostgreSQL the admin search also has trigram and prefix indexes on
+    # lower(email) and lower(full_name), created in migration 3b9e5d21f7a4
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
@@ -22,6 +34,10 @@ class User(Base, TimestampMixin):
     avatar: Mapped[str | None] = mapped_column(String(500), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_superuser: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Set when the account is deleted; its data is purged after a grace period
+    deactivated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     todos: Mapped[list["Todo"]] = relationship("Todo", back_populates="user")
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship(
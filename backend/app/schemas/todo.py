@@ -36,6 +36,7 @@ class TodoResponse(TodoBase):
     user_id: int
     created_at: datetime
     updated_at: datetime
+    archived: bool = False
 
 
 class TodoListResponse(BaseModel):
@@ -46,3 +47,20 @@ class TodoListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+
+
+class TodoPriorityStats(BaseModel):
+    """Todo counts for one priority."""
+
+    priority: int
+    open: int
+    completed: int
+
+
+class TodoStatsResponse(BaseModel):
+    """Schema for a user's todo counts."""
+
+    total: int
+    open: int
+    completed: int
+    by_priority: list[TodoPriorityStats]
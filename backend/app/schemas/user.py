@@ -1,5 +1,6 @@
 import re
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
@@ -65,6 +66,29 @@ class UserUpdate(BaseModel):
         return validate_password_strength(v)
 
 
+class UserImport(BaseModel):
+    """One row of an admin bulk import."""
+
+    email: EmailStr
+    password: str = Field(min_length=8, max_length=128)
+    full_name: str | None = Field(default=None, max_length=100)
+
+    @field_validator("password")
+    @classmethod
+    def password_strength(cls, v: str) -> str:
+        return validate_password_strength(v)
+
+
+class UserImportResult(BaseModel):
+    """Outcome of one imported row, streamed as a line of NDJSON."""
+
+    row: int
+    email: str | None = None
+    status: Literal["created", "exists", "duplicate", "invalid", "skipped"]
+    id: int | None = None
+    error: str | None = None
+
+
 class UserResponse(UserBase):
     """Schema for user response."""
 
@@ -76,6 +100,25 @@ class UserResponse(UserBase):
     updated_at: datetime
 
 
+class UserAdminResponse(UserResponse):
+    """Schema for a user in the admin listing."""
+
+    is_superuser: bool
+
+
+class UserListResponse(BaseModel):
+    """Schema for a keyset-paginated user list.
+
+    Pass the opaque ``next_cursor`` back as ``after`` to fetch the next page;
+    it is null on the last page. ``total`` may be an estimate on large tables.
+    """
+
+    items: list[UserAdminResponse]
+    next_cursor: str | None
+    total: int
+    total_is_estimate: bool
+
+
 class UserInDB(UserBase):
     """Schema for user in database."""
 
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,10 +13,14 @@ from app.schemas.auth import Token
 from app.services.refresh_token import (
     create_refresh_token_record,
     get_refresh_token,
-    revoke_refresh_token,
     revoke_token_family,
+    rotate_refresh_token,
 )
-from app.services.user import authenticate_user, get_user_by_id
+from app.services.user import authenticate_user
+
+# Token claim marking superusers, so middleware can authorize superuser-only
+# features (per-request profiling) before the user is loaded
+SUPERUSER_CLAIM = "su"
 
 
 async def login(
@@ -27,18 +31,20 @@ async def login(
     if not user:
         return None
 
+    claims: dict = {"sub": str(user.id)}
+    if user.is_superuser:
+        claims[SUPERUSER_CLAIM] = True
+
     # Generate access token
     access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data=claims,
         expires_delta=access_token_expires,
     )
 
     # Generate refresh token
     token_family = generate_token_family()
-    refresh_token_jwt = create_refresh_token(
-        data={"sub": str(user.id), "family": token_family}
-    )
+    refresh_token_jwt = create_refresh_token(data={**claims, "family": token_family})
 
     # Store refresh token in database
     await create_refresh_token_record(
@@ -66,46 +72,36 @@ async def refresh_access_token(
     if not user_id or not token_family:
         return None
 
-    # Get refresh token from database
-    token_record = await get_refresh_token(db, refresh_token)
-    if not token_record:
-        return None
-
-    # Check if token is revoked (replay attack detection)
-    if token_record.revoked:
-        # Token has been revoked but is still valid - possible replay attack
-        # Revoke entire token family
-        await revoke_token_family(db, token_family)
-        return None
-
-    # Check if token is expired
-    if token_record.expires_at < datetime.now(timezone.utc):
-        return None
-
-    # Get user
-    user = await get_user_by_id(db, int(user_id))
-    if not user or not user.is_active:
-        return None
-
-    # Revoke old refresh token
-    await revoke_refresh_token(db, token_record)
+    claims: dict = {"sub": user_id}
+    if payload.get(SUPERUSER_CLAIM) is True:
+        claims[SUPERUSER_CLAIM] = True
 
     # Generate new access token
     access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data=claims,
         expires_delta=access_token_expires,
     )
 
     # Generate new refresh token (token rotation)
-    new_refresh_token_jwt = create_refresh_token(
-        data={"sub": str(user.id), "family": token_family}
-    )
-
-    # Store new refresh token in database
-    await create_refresh_token_record(
-        db, user.id, new_refresh_token_jwt, token_family, device_info
+    new_refresh_token_jwt = create_refresh_token(data={**claims, "family": token_family})
+
+    # Revoke the old token and store the new one in a single round trip
+    rotated = await rotate_refresh_token(
+        db,
+        refresh_token,
+        new_refresh_token_jwt,
+        int(user_id),
+        token_family,
+        device_info,
     )
+    if not rotated:
+        # Token has been revoked but is still valid - possible replay attack
+        # Revoke entire token family
+        token_record = await get_refresh_token(db, refresh_token)
+        if token_record and token_record.revoked:
+            await revoke_token_family(db, token_record.token_family)
+        return None
 
     return Token(
         access_token=access_token,
@@ -0,0 +1,141 @@
+"""Account deactivation and the purge of deactivated accounts.
+
+Deleting an account takes effect at once: the user is marked inactive and
+every refresh token is revoked. The rows themselves are removed later by a
+maintenance job, after a grace period and in bounded batches, so a purge
+never holds long locks on the todos or token tables.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.storage import UPLOAD_DIR
+from app.models.base import utc_now
+from app.models.refresh_token import RefreshToken
+from app.models.todo import Todo
+from app.models.todo_archive import TodoArchive
+from app.models.todo_stats import TodoStats
+from app.models.user import User
+from app.services.refresh_token import revoke_all_user_tokens
+
+logger = get_logger(__name__)
+
+# Tables holding per-user rows, emptied batch by batch before the user row
+PURGED_MODELS: tuple[type[Any], ...] = (RefreshToken, Todo, TodoArchive)
+
+
+class DeactivatedUsers:
+    """Ids of users known to be deactivated, kept per process.
+
+    Lets ``get_current_user`` reject a still-valid access token without
+    loading the user. Workers that did not handle the deactivation learn it
+    the first time they load the user; entries expire so the cache stays
+    bounded.
+    """
+
+    def __init__(self) -> None:
+        self._until: dict[int, float] = {}
+
+    def add(self, user_id: int) -> None:
+        now = time.monotonic()
+        if len(self._until) > 10_000:
+            self._until = {u: t for u, t in self._until.items() if t > now}
+        self._until[user_id] = now + settings.deactivated_user_cache_seconds
+
+    def __contains__(self, user_id: int) -> bool:
+        return self._until.get(user_id, 0.0) > time.monotonic()
+
+    def clear(self) -> None:
+        self._until.clear()
+
+
+deactivated_users = DeactivatedUsers()
+
+
+async def deactivate_user(db: AsyncSession, user: User) -> None:
+    """Deactivate an account and revoke all of its sessions immediately.
+
+    The cache only learns of the deactivation once it is committed, so a
+    failed commit never locks out a user who is still active.
+    """
+    user.is_active = False
+    user.deactivated_at = utc_now()
+    await revoke_all_user_tokens(db, user.id)
+    await db.commit()
+    deactivated_users.add(user.id)
+
+
+async def _delete_in_batches(
+    db: AsyncSession, model: type[Any], user_ids: list[int], batch_size: int
+) -> int:
+    total = 0
+    while True:
+        batch = (
+            select(model.id).where(model.user_id.in_(user_ids)).limit(batch_size)
+        )
+        result = cast(
+            CursorResult[Any],
+            await db.execute(
+                delete(model)
+                .where(model.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+def _remove_avatar(avatar: str | None) -> None:
+    if not avatar:
+        return
+    path = UPLOAD_DIR / avatar.split("/")[-1]
+    path.unlink(missing_ok=True)
+
+
+async def purge_deactivated_users(
+    db: AsyncSession, deactivated_before: datetime, batch_size: int
+) -> int:
+    """Hard-delete accounts deactivated before the cutoff, with all their data.
+
+    Users are taken ``batch_size`` at a time; their tokens and todos are
+    deleted in committed batches of at most ``batch_size`` rows before the
+    counters and the user rows go. Returns the number of users purged.
+    """
+    purged = 0
+    while True:
+        result = await db.execute(
+            select(User.id, User.avatar)
+            .where(User.is_active.is_(False), User.deactivated_at < deactivated_before)
+            .order_by(User.id)
+            .limit(batch_size)
+        )
+        users = result.all()
+        if not users:
+            return purged
+
+        user_ids = [user.id for user in users]
+        for model in PURGED_MODELS:
+            await _delete_in_batches(db, model, user_ids, batch_size)
+        await db.execute(delete(TodoStats).where(TodoStats.user_id.in_(user_ids)))
+        await db.execute(
+            delete(User)
+            .where(User.id.in_(user_ids), User.is_active.is_(False))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        for user in users:
+            _remove_avatar(user.avatar)
+        purged += len(users)
+        logger.info("deactivated_users_purged", count=len(users))
+        if len(users) < batch_size:
+            return purged
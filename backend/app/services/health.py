@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import anyio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.core.storage import UPLOAD_DIR
+
+
+class ReadinessCache:
+    """Keep the last readiness result for a short time.
+
+    Concurrent checks while the cache is cold share one probe run, so a burst
+    of health checks turns into a single round of dependency probes.
+    """
+
+    def __init__(self) -> None:
+        self.result: dict[str, Any] | None = None
+        self.expires_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def clear(self) -> None:
+        self.result = None
+        self.expires_at = 0.0
+
+
+readiness_cache = ReadinessCache()
+
+
+async def _probe(check: Callable[[], Awaitable[Any]]) -> dict[str, Any]:
+    """Run a dependency check with a timeout and report its latency."""
+    start = time.perf_counter()
+    error: str | None = None
+    try:
+        # Raises the builtin TimeoutError on every Python version
+        with anyio.fail_after(settings.readiness_timeout_seconds):
+            await check()
+    except TimeoutError:
+        error = "timeout"
+    except Exception as exc:  # noqa: BLE001
+        error = type(exc).__name__
+
+    result: dict[str, Any] = {
+        "status": "ok" if error is None else "error",
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+async def check_database(db: AsyncSession) -> None:
+    await db.execute(text("SELECT 1"))
+
+
+async def check_storage() -> None:
+    def writable() -> None:
+        if not os.access(UPLOAD_DIR, os.W_OK):
+            raise PermissionError(str(UPLOAD_DIR))
+
+    await asyncio.to_thread(writable)
+
+
+async def check_readiness(db: AsyncSession) -> dict[str, Any]:
+    """Probe the database and upload storage, caching the result briefly."""
+    cache = readiness_cache
+    if cache.result is not None and time.monotonic() < cache.expires_at:
+        CACHE_REQUESTS.inc("readiness", "hit")
+        return {**cache.result, "cached": True}
+
+    async with cache.lock:
+        # Another request may have refreshed the cache while we waited
+        if cache.result is not None and time.monotonic() < cache.expires_at:
+            CACHE_REQUESTS.inc("readiness", "hit")
+            return {**cache.result, "cached": True}
+
+        CACHE_REQUESTS.inc("readiness", "miss")
+        checks = {
+            "database": await _probe(lambda: check_database(db)),
+            "storage": await _probe(check_storage),
+        }
+        ready = all(check["status"] == "ok" for check in checks.values())
+        cache.result = {"status": "ready" if ready else "not_ready", "checks": checks}
+        cache.expires_at = time.monotonic() + settings.readiness_cache_seconds
+        return {**cache.result, "cached": False}
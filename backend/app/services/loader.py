@@ -0,0 +1,116 @@
+"""Request-scoped entity loading.
+
+A session lives for one request, so its identity map already is a
+per-request cache: a row loaded once (by a dependency, a service or a
+previous flush) is returned again without a query. Lookups issued
+concurrently in the same event loop tick are batched into a single
+``WHERE id IN (...)`` query, run in the first caller's task; batches of
+different models take turns on the session. Both statements are built
+once per model and reused, like the other hot lookups in this package.
+"""
+
+import asyncio
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Select, bindparam, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import instance_state
+from sqlalchemy.orm.util import identity_key
+
+ModelT = TypeVar("ModelT")
+
+LOADERS = "loaders"
+SESSION_LOCK = "loader_lock"
+
+_statements: dict[type[Any], tuple[Select[Any], Select[Any]]] = {}
+
+
+def pk_statements(model: type[Any]) -> tuple[Select[Any], Select[Any]]:
+    """Single-row and batch primary-key lookups for a model."""
+    if model not in _statements:
+        pk = inspect(model).primary_key[0]
+        _statements[model] = (
+            select(model).where(pk == bindparam("pk")),
+            select(model).where(pk.in_(bindparam("pks", expanding=True))),
+        )
+    return _statements[model]
+
+
+class Loader(Generic[ModelT]):
+    """Deduplicating, batching primary-key loader for one model."""
+
+    def __init__(self, db: AsyncSession, model: type[ModelT]) -> None:
+        self.db = db
+        self.model = model
+        self._pending: dict[Any, asyncio.Future[ModelT | None]] = {}
+        # The identity map holds rows weakly; keep loaded ones for the session
+        self._loaded: list[ModelT] = []
+
+    def cached(self, key: Any) -> ModelT | None:
+        """Return the instance from the identity map if it is fully loaded."""
+        instance = self.db.identity_map.get(identity_key(self.model, key))
+        if instance is None or instance_state(instance).expired_attributes:
+            return None
+        return instance  # type: ignore[no-any-return]
+
+    async def load(self, key: Any) -> ModelT | None:
+        instance = self.cached(key)
+        if instance is not None:
+            return instance
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) == 1:
+                await self._dispatch()
+        return await future
+
+    async def _dispatch(self) -> None:
+        # Runs in the task of the first caller; the session must not be
+        # used from a second task, nor by two batches at the same time
+        batch: dict[Any, asyncio.Future[ModelT | None]] = {}
+        try:
+            # Let other coroutines of this tick add their keys first
+            await asyncio.sleep(0)
+            async with session_lock(self.db):
+                batch, self._pending = self._pending, {}
+                await self._fetch(batch)
+        except asyncio.CancelledError:
+            if not batch:
+                batch, self._pending = self._pending, {}
+            for future in batch.values():
+                future.cancel()
+            raise
+
+    async def _fetch(self, batch: dict[Any, asyncio.Future[ModelT | None]]) -> None:
+        try:
+            by_pk, by_pks = pk_statements(self.model)
+            if len(batch) == 1:
+                (key,) = batch
+                result = await self.db.execute(by_pk, {"pk": key})
+            else:
+                result = await self.db.execute(by_pks, {"pks": list(batch)})
+            found = {inspect(row).identity[0]: row for row in result.scalars()}
+            self._loaded.extend(found.values())
+        except Exception as exc:  # noqa: BLE001 - handed to every waiter
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+
+def session_lock(db: AsyncSession) -> asyncio.Lock:
+    """Return the lock serializing the session's loader queries."""
+    return db.info.setdefault(SESSION_LOCK, asyncio.Lock())  # type: ignore[no-any-return]
+
+
+def loader(db: AsyncSession, model: type[ModelT]) -> Loader[ModelT]:
+    """Return the session's loader for a model, creating it on first use."""
+    loaders = db.info.setdefault(LOADERS, {})
+    if model not in loaders:
+        loaders[model] = Loader(db, model)
+    return loaders[model]  # type: ignore[no-any-return]
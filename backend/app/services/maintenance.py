@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.scheduler import Scheduler
+from app.db.session import AsyncSessionLocal
+from app.services.deactivation import purge_deactivated_users
+from app.services.refresh_token import cleanup_expired_tokens
+from app.services.todo import archive_completed_todos
+
+
+async def cleanup_refresh_tokens() -> int:
+    """Remove expired refresh tokens in bounded batches."""
+    async with AsyncSessionLocal() as db:
+        return await cleanup_expired_tokens(
+            db, batch_size=settings.maintenance_batch_size
+        )
+
+
+async def archive_todos() -> int:
+    """Move long-completed todos to the archive in bounded batches."""
+    if settings.todo_archive_after_days is None:
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.todo_archive_after_days)
+    async with AsyncSessionLocal() as db:
+        return await archive_completed_todos(
+            db, cutoff, batch_size=settings.maintenance_batch_size
+        )
+
+
+async def purge_deactivated() -> int:
+    """Delete accounts whose deactivation grace period has passed."""
+    if settings.deactivated_user_purge_after_days is None:
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=settings.deactivated_user_purge_after_days
+    )
+    async with AsyncSessionLocal() as db:
+        return await purge_deactivated_users(
+            db, cutoff, batch_size=settings.maintenance_batch_size
+        )
+
+
+def register_maintenance_jobs(scheduler: Scheduler) -> None:
+    """Register the periodic maintenance jobs on the scheduler."""
+    scheduler.register(
+        "cleanup_refresh_tokens",
+        cleanup_refresh_tokens,
+        interval_seconds=settings.refresh_token_cleanup_interval_seconds,
+        jitter_seconds=settings.maintenance_jitter_seconds,
+    )
+    if settings.todo_archive_after_days is not None:
+        scheduler.register(
+            "archive_todos",
+            archive_todos,
+            interval_seconds=settings.todo_archive_interval_seconds,
+            jitter_seconds=settings.maintenance_jitter_seconds,
+        )
+    if settings.deactivated_user_purge_after_days is not None:
+        scheduler.register(
+            "purge_deactivated_users",
+            purge_deactivated,
+            interval_seconds=settings.deactivated_user_purge_interval_seconds,
+            jitter_seconds=settings.maintenance_jitter_seconds,
+        )
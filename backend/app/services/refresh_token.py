@@ -1,10 +1,30 @@
 from datetime import datetime, timedelta, timezone
-
-from sqlalchemy import delete, select
+from typing import Any, cast
+
+from sqlalchemy import (
+    DateTime,
+    LargeBinary,
+    String,
+    Table,
+    bindparam,
+    delete,
+    exists,
+    false,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.security import hash_token
 from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+# Built once so repeated lookups skip statement construction (see services/user.py)
+TOKEN_BY_HASH = select(RefreshToken).where(RefreshToken.token_hash == bindparam("token_hash"))
 
 
 async def create_refresh_token_record(
@@ -21,7 +41,7 @@ async def create_refresh_token_record(
 
     refresh_token = RefreshToken(
         user_id=user_id,
-        token=token,
+        token_hash=hash_token(token),
         token_family=token_family,
         expires_at=expires_at,
         device_info=device_info,
@@ -29,7 +49,6 @@ async def create_refresh_token_record(
 
     db.add(refresh_token)
     await db.flush()
-    await db.refresh(refresh_token)
     return refresh_token
 
 
@@ -37,12 +56,92 @@ async def get_refresh_token(
     db: AsyncSession, token: str
 ) -> RefreshToken | None:
     """Get a refresh token record by token string."""
-    result = await db.execute(
-        select(RefreshToken).where(RefreshToken.token == token)
-    )
+    result = await db.execute(TOKEN_BY_HASH, {"token_hash": hash_token(token)})
     return result.scalar_one_or_none()
 
 
+async def rotate_refresh_token(
+    db: AsyncSession,
+    token: str,
+    new_token: str,
+    user_id: int,
+    token_family: str,
+    device_info: str | None = None,
+) -> bool:
+    """Revoke a live refresh token and store its replacement; return whether it did."""
+    # Declarative classes expose their table only as a FromClause
+    tokens = cast(Table, RefreshToken.__table__)
+    users = cast(Table, User.__table__)
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=settings.jwt_refresh_token_expire_days)
+
+    # Conditional, so only one of several concurrent refreshes succeeds
+    revoke_old = (
+        update(tokens)
+        .where(
+            tokens.c.token_hash == hash_token(token),
+            tokens.c.user_id == user_id,
+            tokens.c.token_family == token_family,
+            tokens.c.revoked.is_(False),
+            tokens.c.expires_at > now,
+            exists().where(users.c.id == tokens.c.user_id, users.c.is_active.is_(True)),
+        )
+        .values(revoked=True, updated_at=now)
+        .returning(tokens.c.user_id, tokens.c.token_family)
+    )
+
+    # PostgreSQL revokes and inserts in one statement via a data-modifying
+    # CTE; other dialects need a second round trip
+    if db.get_bind().dialect.name == "postgresql":
+        revoked = revoke_old.cte("revoked")
+        stmt = (
+            insert(tokens)
+            .from_select(
+                [
+                    tokens.c.user_id,
+                    tokens.c.token_hash,
+                    tokens.c.token_family,
+                    tokens.c.expires_at,
+                    tokens.c.revoked,
+                    tokens.c.device_info,
+                    tokens.c.created_at,
+                    tokens.c.updated_at,
+                ],
+                select(
+                    revoked.c.user_id,
+                    literal(hash_token(new_token), LargeBinary),
+                    revoked.c.token_family,
+                    literal(expires_at, DateTime(timezone=True)),
+                    false(),
+                    literal(device_info, String),
+                    literal(now, DateTime(timezone=True)),
+                    literal(now, DateTime(timezone=True)),
+                ),
+            )
+            .add_cte(revoked)
+            .returning(tokens.c.id)
+        )
+        result = await db.execute(stmt)
+        return result.first() is not None
+
+    result = await db.execute(revoke_old)
+    if result.first() is None:
+        return False
+    await db.execute(
+        insert(tokens).values(
+            user_id=user_id,
+            token_hash=hash_token(new_token),
+            token_family=token_family,
+            expires_at=expires_at,
+            revoked=False,
+            device_info=device_info,
+            created_at=now,
+            updated_at=now,
+        )
+    )
+    return True
+
+
 async def revoke_refresh_token(db: AsyncSession, token: RefreshToken) -> None:
     """Mark a refresh token as revoked."""
     token.revoked = True
@@ -65,11 +164,35 @@ async def revoke_token_family(db: AsyncSession, token_family: str) -> None:
     await db.flush()
 
 
-async def cleanup_expired_tokens(db: AsyncSession) -> int:
-    """Delete expired refresh tokens from the database."""
+async def cleanup_expired_tokens(
+    db: AsyncSession, batch_size: int | None = None
+) -> int:
+    """Delete expired refresh tokens, in committed batches if ``batch_size`` is given."""
     now = datetime.now(timezone.utc)
-    result = await db.execute(
-        delete(RefreshToken).where(RefreshToken.expires_at < now)
-    )
-    await db.flush()
-    return result.rowcount
+    if batch_size is None:
+        result = cast(
+            CursorResult[Any],
+            await db.execute(delete(RefreshToken).where(RefreshToken.expires_at < now)),
+        )
+        await db.flush()
+        return result.rowcount
+
+    total = 0
+    while True:
+        expired_ids = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .limit(batch_size)
+        )
+        result = cast(
+            CursorResult[Any],
+            await db.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(expired_ids))
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
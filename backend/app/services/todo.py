@@ -1,8 +1,44 @@
-from sqlalchemy import func, select
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    Row,
+    bindparam,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.base import utc_now
 from app.models.todo import Todo
+from app.models.todo_archive import TodoArchive
 from app.schemas.todo import TodoCreate, TodoUpdate
+from app.services.loader import loader
+from app.services.todo_stats import StatsDelta, adjust_todo_stats
+
+# Columns shared by todos and todos_archive
+TODO_COLUMNS = (
+    "id", "title", "description", "completed", "priority", "user_id", "created_at", "updated_at",
+)
+
+
+def _columns(model: type[Any]) -> list[Any]:
+    return [getattr(model, name) for name in TODO_COLUMNS]
+
+
+# Re-read under a row lock even when the session already holds the todo
+TODO_FOR_UPDATE = (
+    select(Todo)
+    .where(Todo.id == bindparam("todo_id"), Todo.user_id == bindparam("user_id"))
+    .with_for_update()
+    .execution_options(populate_existing=True)
+)
 
 
 async def get_todos(
@@ -11,8 +47,16 @@ async def get_todos(
     page: int = 1,
     page_size: int = 10,
     completed: bool | None = None,
-) -> tuple[list[Todo], int]:
-    """Get paginated todos for a user."""
+    include_archived: bool = False,
+) -> tuple[list[Todo] | list[Row[Any]], int]:
+    """Get paginated todos for a user.
+
+    Only the active table is read unless ``include_archived`` is set; archived
+    todos are completed, so they are never part of a ``completed=False`` page.
+    """
+    if include_archived and completed is not False:
+        return await _get_todos_with_archive(db, user_id, page, page_size, completed)
+
     query = select(Todo).where(Todo.user_id == user_id)
 
     if completed is not None:
@@ -32,11 +76,45 @@ async def get_todos(
     return todos, total
 
 
-async def get_todo_by_id(db: AsyncSession, todo_id: int, user_id: int) -> Todo | None:
-    """Get a todo by ID for a specific user."""
+async def _get_todos_with_archive(
+    db: AsyncSession, user_id: int, page: int, page_size: int, completed: bool | None
+) -> tuple[list[Row[Any]], int]:
+    active = select(*_columns(Todo), false().label("archived")).where(Todo.user_id == user_id)
+    if completed is not None:
+        active = active.where(Todo.completed == completed)
+    combined = union_all(
+        active,
+        select(*_columns(TodoArchive), true().label("archived")).where(
+            TodoArchive.user_id == user_id
+        ),
+    ).subquery()
+
+    total = await db.scalar(select(func.count()).select_from(combined)) or 0
     result = await db.execute(
-        select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
+        select(combined)
+        .order_by(combined.c.priority.desc(), combined.c.created_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
     )
+    return list(result.all()), total
+
+
+async def get_todo_by_id(db: AsyncSession, todo_id: int, user_id: int) -> Todo | None:
+    """Get a todo by ID for a specific user."""
+    todo = await loader(db, Todo).load(todo_id)
+    if todo is None or todo.user_id != user_id:
+        return None
+    return todo
+
+
+async def get_todo_for_update(db: AsyncSession, todo_id: int, user_id: int) -> Todo | None:
+    """Get a todo to change, locking its row until the transaction ends.
+
+    Concurrent changes to the same todo wait for each other, so the stats
+    adjustments always start from the stored values, and a todo archived
+    meanwhile is simply not found.
+    """
+    result = await db.execute(TODO_FOR_UPDATE, {"todo_id": todo_id, "user_id": user_id})
     return result.scalar_one_or_none()
 
 
@@ -50,30 +128,75 @@ async def create_todo(db: AsyncSession, user_id: int, todo_in: TodoCreate) -> To
     )
     db.add(todo)
     await db.flush()
-    await db.refresh(todo)
+    await adjust_todo_stats(db, user_id, StatsDelta({(todo.completed, todo.priority): 1}))
     return todo
 
 
+def _moved(before: tuple[bool, int], todo: Todo) -> StatsDelta:
+    """Stats change for a todo whose (completed, priority) was ``before``."""
+    delta = StatsDelta({before: -1})
+    delta[(todo.completed, todo.priority)] += 1
+    return delta
+
+
 async def update_todo(db: AsyncSession, todo: Todo, todo_in: TodoUpdate) -> Todo:
     """Update a todo."""
+    before = (todo.completed, todo.priority)
     update_data = todo_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(todo, field, value)
 
     await db.flush()
-    await db.refresh(todo)
+    await adjust_todo_stats(db, todo.user_id, _moved(before, todo))
     return todo
 
 
 async def delete_todo(db: AsyncSession, todo: Todo) -> None:
     """Delete a todo."""
     await db.delete(todo)
+    await adjust_todo_stats(db, todo.user_id, StatsDelta({(todo.completed, todo.priority): -1}))
     await db.commit()
 
 
 async def toggle_todo(db: AsyncSession, todo: Todo) -> Todo:
     """Toggle todo completed status."""
+    before = (todo.completed, todo.priority)
     todo.completed = not todo.completed
     await db.flush()
-    await db.refresh(todo)
+    await adjust_todo_stats(db, todo.user_id, _moved(before, todo))
     return todo
+
+
+async def archive_completed_todos(
+    db: AsyncSession, completed_before: datetime, batch_size: int
+) -> int:
+    """Move old completed todos to todos_archive in batches; return how many moved."""
+    total = 0
+    while True:
+        ids = list(
+            await db.scalars(
+                select(Todo.id)
+                .where(Todo.completed.is_(True), Todo.updated_at < completed_before)
+                .order_by(Todo.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        if not ids:
+            return total
+
+        await db.execute(
+            insert(TodoArchive).from_select(
+                [*TODO_COLUMNS, "archived_at"],
+                select(*_columns(Todo), literal(utc_now(), TodoArchive.archived_at.type)).where(
+                    Todo.id.in_(ids)
+                ),
+            )
+        )
+        await db.execute(
+            delete(Todo).where(Todo.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
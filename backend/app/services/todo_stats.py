@@ -0,0 +1,64 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import bindparam, delete, func, insert, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.todo import Todo
+from app.models.todo_archive import TodoArchive
+from app.models.todo_stats import TodoStats
+
+# (completed, priority) -> change in the number of todos
+StatsDelta = Counter[tuple[bool, int]]
+
+STATS_BY_USER = select(TodoStats.completed, TodoStats.priority, TodoStats.count).where(
+    TodoStats.user_id == bindparam("user_id")
+)
+
+
+async def adjust_todo_stats(db: AsyncSession, user_id: int, delta: StatsDelta) -> None:
+    """Apply count changes for one user in a single atomic upsert."""
+    rows = [
+        {"user_id": user_id, "completed": completed, "priority": priority, "count": change}
+        for (completed, priority), change in delta.items()
+        if change
+    ]
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = TodoStats.__table__
+    stmt = dialect.insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.completed, table.c.priority],
+        set_={"count": table.c.count + stmt.excluded.count},
+    )
+    await db.execute(stmt)
+
+
+async def get_todo_stats(db: AsyncSession, user_id: int) -> dict[tuple[bool, int], int]:
+    """Return a user's todo counts keyed by (completed, priority)."""
+    result = await db.execute(STATS_BY_USER, {"user_id": user_id})
+    return {(completed, priority): count for completed, priority, count in result if count}
+
+
+async def rebuild_todo_stats(db: AsyncSession, user_ids: Iterable[int] | None = None) -> None:
+    """Recount stats, archived todos included, for some users or everyone."""
+    active = select(Todo.user_id, Todo.completed, Todo.priority)
+    archived = select(TodoArchive.user_id, TodoArchive.completed, TodoArchive.priority)
+    clear = delete(TodoStats)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        active = active.where(Todo.user_id.in_(user_ids))
+        archived = archived.where(TodoArchive.user_id.in_(user_ids))
+        clear = clear.where(TodoStats.user_id.in_(user_ids))
+    todos = union_all(active, archived).subquery()
+    recount = select(todos.c.user_id, todos.c.completed, todos.c.priority, func.count()).group_by(
+        todos.c.user_id, todos.c.completed, todos.c.priority
+    )
+    await db.execute(clear)
+    await db.execute(
+        insert(TodoStats).from_select(
+            ["user_id", "completed", "priority", "count"], recount
+        )
+    )
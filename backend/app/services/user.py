@@ -1,47 +1,185 @@
-from sqlalchemy import select
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Select, bindparam, func, or_, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password, verify_password
+from app.core.security import (
+    hash_password_async,
+    hash_passwords_bulk,
+    verify_password_async,
+)
+from app.models.base import utc_now
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserImport, UserUpdate
+from app.services.loader import loader
+
+# Built once: the statement and its cache key are reused, so each call goes
+# straight to SQLAlchemy's compiled cache.
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
 
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """Get a user by email."""
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(USER_BY_EMAIL, {"email": email})
     return result.scalar_one_or_none()
 
 
 async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
-    """Get a user by ID."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
+    """Get a user by ID (at most one query per request)."""
+    return await loader(db, User).load(user_id)
 
 
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     """Create a new user."""
     user = User(
         email=user_in.email,
-        hashed_password=hash_password(user_in.password),
+        hashed_password=await hash_password_async(user_in.password),
         full_name=user_in.full_name,
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
     return user
 
 
+# Shorter search terms cannot use the trigram indexes, so they match prefixes
+MIN_SUBSTRING_SEARCH = 3
+
+# Planner estimate of the table size; -1 until the table was first analyzed
+USERS_RELTUPLES = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+
+
+def user_filters(search: str | None = None, is_active: bool | None = None) -> list[Any]:
+    """WHERE clauses for the admin user listing.
+
+    Searches lower(email) and lower(full_name), which the pg_trgm GIN indexes
+    (substring) and text_pattern_ops indexes (prefix) cover on PostgreSQL.
+    """
+    filters: list[Any] = []
+    if search:
+        term = search.lower()
+        if len(term) < MIN_SUBSTRING_SEARCH:
+            filters.append(
+                or_(
+                    func.lower(User.email).startswith(term, autoescape=True),
+                    func.lower(User.full_name).startswith(term, autoescape=True),
+                )
+            )
+        else:
+            filters.append(
+                or_(
+                    func.lower(User.email).contains(term, autoescape=True),
+                    func.lower(User.full_name).contains(term, autoescape=True),
+                )
+            )
+    if is_active is not None:
+        filters.append(User.is_active == is_active)
+    return filters
+
+
+async def count_users(db: AsyncSession, filters: list[Any]) -> tuple[int, bool]:
+    """Count matching users, estimating on PostgreSQL.
+
+    Returns ``(count, is_estimate)``. An exact COUNT(*) has to visit every
+    matching row; instead the unfiltered count comes from ``pg_class.reltuples``
+    and filtered counts from the planner's row estimate.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        if not filters:
+            estimate = await db.scalar(USERS_RELTUPLES)
+            if estimate is not None and estimate >= 0:
+                return int(estimate), True
+        else:
+            return await _planner_estimate(db, select(User.id).where(*filters)), True
+
+    total = await db.scalar(select(func.count()).select_from(User).where(*filters))
+    return total or 0, False
+
+
+async def _planner_estimate(db: AsyncSession, query: Select[Any]) -> int:
+    conn = await db.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    plan = result.scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def list_users(
+    db: AsyncSession,
+    after: int | None = None,
+    limit: int = 50,
+    search: str | None = None,
+    is_active: bool | None = None,
+) -> tuple[list[User], int | None]:
+    """Get one keyset page of users ordered by id.
+
+    Returns the users and the cursor for the next page (None on the last
+    page). Unlike OFFSET, seeking past ``after`` costs the same on every page.
+    """
+    query = select(User).where(*user_filters(search, is_active))
+    if after is not None:
+        query = query.where(User.id > after)
+    # One extra row tells whether there is a next page
+    query = query.order_by(User.id).limit(limit + 1)
+
+    result = await db.execute(query)
+    users = list(result.scalars().all())
+    if len(users) > limit:
+        users = users[:limit]
+        return users, users[-1].id
+    return users, None
+
+
+async def import_users(db: AsyncSession, users: Sequence[UserImport]) -> dict[str, int]:
+    """Insert a batch of users, skipping emails that are already taken.
+
+    Passwords are hashed on the bulk process pool and the batch goes in as one
+    multi-row ``INSERT ... ON CONFLICT (email) DO NOTHING``, so concurrent
+    imports and registrations never fail on the unique index. Returns the ids
+    of the rows actually created, keyed by email.
+    """
+    if not users:
+        return {}
+    hashed = await hash_passwords_bulk([user.password for user in users])
+    now = utc_now()
+    rows = [
+        {
+            "email": user.email,
+            "hashed_password": hashed_password,
+            "full_name": user.full_name,
+            "is_active": True,
+            "is_superuser": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for user, hashed_password in zip(users, hashed)
+    ]
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = User.__table__
+    stmt = (
+        dialect.insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[table.c.email])
+        .returning(table.c.id, table.c.email)
+    )
+    result = await db.execute(stmt)
+    return {email: user_id for user_id, email in result.all()}
+
+
 async def update_user(db: AsyncSession, user: User, user_in: UserUpdate) -> User:
     """Update a user."""
     update_data = user_in.model_dump(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password_async(
+            update_data.pop("password")
+        )
 
     for field, value in update_data.items():
         setattr(user, field, value)
 
     await db.flush()
-    await db.refresh(user)
     return user
 
 
@@ -52,6 +190,9 @@ async def authenticate_user(
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    # Deleted accounts cannot start new sessions
+    if not user.is_active:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
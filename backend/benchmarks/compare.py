@@ -0,0 +1,56 @@
+"""Compare two benchmark result files and flag regressions.
+
+Example:
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative p95 increase or RPS drop that counts as a regression",
+    )
+    return parser.parse_args()
+
+
+def relative_change(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def main() -> None:
+    args = parse_args()
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["scenarios"]
+    current = json.loads(args.current.read_text(encoding="utf-8"))["scenarios"]
+
+    regressions = []
+    print(f"{'scenario':<14} {'p95 (ms)':>22} {'rps':>22}")
+    for name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[name], current[name]
+        p95_change = relative_change(old["latency_ms"]["p95"], new["latency_ms"]["p95"])
+        rps_change = relative_change(old["rps"], new["rps"])
+        print(
+            f"{name:<14} "
+            f"{old['latency_ms']['p95']:>8.2f} -> {new['latency_ms']['p95']:>8.2f} ({p95_change:+.0%}) "
+            f"{old['rps']:>8.1f} -> {new['rps']:>8.1f} ({rps_change:+.0%})"
+        )
+        if p95_change > args.threshold or rps_change < -args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Seed data and per-user client state for benchmark runs."""
+
+import base64
+
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+
+from benchmarks.scenarios import BENCH_PASSWORD, BenchUser
+
+# 1x1 transparent PNG used for the avatar scenario
+AVATAR_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+def bench_email(index: int) -> str:
+    return f"bench-{index}@example.com"
+
+
+async def seed_database(users: int, todos_per_user: int) -> None:
+    """Create tables and insert benchmark users with their todos if missing."""
+    from app.core.security import hash_password
+    from app.db.session import AsyncSessionLocal, get_engine
+    from app.models import Base
+    from app.models.todo import Todo
+    from app.models.user import User
+    from app.services.todo_stats import rebuild_todo_stats
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # bcrypt is deliberately slow, so every benchmark user shares one hash
+    hashed_password = hash_password(BENCH_PASSWORD)
+    emails = [bench_email(i) for i in range(users)]
+
+    async with AsyncSessionLocal() as db:
+        existing = set(
+            (await db.scalars(select(User.email).where(User.email.in_(emails)))).all()
+        )
+        for email in emails:
+            if email in existing:
+                continue
+            user = User(email=email, hashed_password=hashed_password, full_name="Bench User")
+            db.add(user)
+            await db.flush()
+            if todos_per_user:
+                await db.execute(
+                    insert(Todo),
+                    [
+                        {
+                            "title": f"Todo {i}",
+                            "description": "Seeded for benchmarks",
+                            "priority": i % 3,
+                            "completed": i % 4 == 0,
+                            "user_id": user.id,
+                        }
+                        for i in range(todos_per_user)
+                    ],
+                )
+        # The bulk inserts bypass the todo services, so recount the stats
+        await rebuild_todo_stats(db)
+        await db.commit()
+
+
+async def prepare_users(client: AsyncClient, count: int) -> list[BenchUser]:
+    """Log every virtual user in and collect the ids it will operate on."""
+    from benchmarks.scenarios import login
+
+    users = [BenchUser(email=bench_email(i)) for i in range(count)]
+    for user in users:
+        response = await login(client, user)
+        response.raise_for_status()
+        response = await client.get(
+            "/api/v1/todos", params={"page_size": 100}, headers=user.headers
+        )
+        response.raise_for_status()
+        user.todo_ids = [item["id"] for item in response.json()["items"]]
+
+    response = await client.post(
+        "/api/v1/users/me/avatar",
+        files={"file": ("bench.png", AVATAR_PNG, "image/png")},
+        headers=users[0].headers,
+    )
+    response.raise_for_status()
+    avatar_url = response.json()["avatar"]
+    for user in users:
+        user.avatar_url = avatar_url
+    return users
+
+
+def remove_avatar(user: BenchUser) -> None:
+    """Delete the avatar file uploaded for the benchmark run."""
+    from app.core.storage import UPLOAD_DIR
+
+    if user.avatar_url:
+        (UPLOAD_DIR / user.avatar_url.rsplit("/", 1)[-1]).unlink(missing_ok=True)
@@ -0,0 +1,199 @@
+"""Run API latency benchmarks and save the results as JSON.
+
+Examples:
+    python -m benchmarks.run
+    python -m benchmarks.run --mode uvicorn --concurrency 20 --duration 15
+    python -m benchmarks.run --database-url postgresql+psycopg://... -o pg.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.scenarios import SCENARIOS, BenchUser
+from benchmarks.stats import ScenarioResult
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode",
+        choices=["inprocess", "uvicorn"],
+        default="inprocess",
+        help="drive the ASGI app in-process or a uvicorn server over loopback",
+    )
+    parser.add_argument(
+        "--database-url",
+        help="database to benchmark against (default: a temporary SQLite file)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"comma separated subset of: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--todos-per-user", type=int, default=200)
+    parser.add_argument("-o", "--output", type=Path, help="write JSON results here")
+    return parser.parse_args()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def inprocess_client() -> AsyncIterator[httpx.AsyncClient]:
+    from app.main import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        yield client
+
+
+@asynccontextmanager
+async def uvicorn_client() -> AsyncIterator[httpx.AsyncClient]:
+    port = free_port()
+    env = {**os.environ, "MAINTENANCE_ENABLED": "false", "DEBUG": "false"}
+    command = ["uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", *command, "--no-access-log", cwd=BACKEND_DIR, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    await client.get("/api/v1/health")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or server.returncode is not None:
+                        raise RuntimeError("uvicorn did not start") from None
+                    await asyncio.sleep(0.2)
+            yield client
+    finally:
+        if server.returncode is None:
+            server.terminate()
+            await asyncio.wait_for(server.wait(), timeout=10)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, name: str, users: list[BenchUser], duration: float
+) -> ScenarioResult:
+    """Run one scenario with a worker per user until the duration elapses."""
+    scenario = SCENARIOS[name]
+    result = ScenarioResult(name=name)
+    deadline = time.perf_counter() + duration
+
+    async def worker(user: BenchUser) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, user)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            result.latencies.append(time.perf_counter() - start)
+            if failed:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(user) for user in users))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from benchmarks.fixtures import prepare_users, remove_avatar, seed_database
+
+    await seed_database(args.concurrency, args.todos_per_user)
+    commit = await asyncio.to_thread(git_commit)
+
+    client_factory = uvicorn_client if args.mode == "uvicorn" else inprocess_client
+    scenarios: dict[str, dict] = {}
+    async with client_factory() as client:
+        users = await prepare_users(client, args.concurrency)
+        try:
+            for name in args.scenarios.split(","):
+                result = await run_scenario(client, name, users, args.duration)
+                scenarios[name] = result.summary()
+                latency = scenarios[name]["latency_ms"]
+                print(
+                    f"{name:<14} {scenarios[name]['rps']:>9.1f} req/s  "
+                    f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+                    f"p99 {latency['p99']:>8.2f} ms  errors {result.errors}"
+                )
+        finally:
+            remove_avatar(users[0])
+
+    return {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": args.mode,
+            "database": args.database_url.split("://", 1)[0],
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "todos_per_user": args.todos_per_user,
+            "python": platform.python_version(),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if not args.database_url:
+            args.database_url = f"sqlite+aiosqlite:///{tmpdir}/bench.db"
+        # Settings are read at import time, so configure before importing app
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.setdefault("DEBUG", "false")
+        # One log line per request would dominate the measured latencies
+        os.environ["ACCESS_LOG_ENABLED"] = "false"
+        results = asyncio.run(run(args))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
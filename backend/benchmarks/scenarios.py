@@ -0,0 +1,90 @@
+"""Scripted request scenarios driven by the benchmark runner."""
+
+import itertools
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from httpx import AsyncClient, Response
+
+BENCH_PASSWORD = "benchmark123"
+
+
+@dataclass
+class BenchUser:
+    """A seeded user and the state its virtual client carries between requests."""
+
+    email: str
+    access_token: str = ""
+    refresh_token: str = ""
+    todo_ids: list[int] = field(default_factory=list)
+    avatar_url: str | None = None
+    _todo_cycle: itertools.cycle | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    def next_todo_id(self) -> int:
+        if self._todo_cycle is None:
+            self._todo_cycle = itertools.cycle(self.todo_ids)
+        return next(self._todo_cycle)
+
+
+async def login(client: AsyncClient, user: BenchUser) -> Response:
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": user.email, "password": BENCH_PASSWORD},
+    )
+    if response.status_code == 200:
+        tokens = response.json()
+        user.access_token = tokens["access_token"]
+        user.refresh_token = tokens["refresh_token"]
+    return response
+
+
+async def refresh(client: AsyncClient, user: BenchUser) -> Response:
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": user.refresh_token},
+    )
+    if response.status_code == 200:
+        tokens = response.json()
+        user.access_token = tokens["access_token"]
+        user.refresh_token = tokens["refresh_token"]
+    return response
+
+
+async def list_todos(client: AsyncClient, user: BenchUser) -> Response:
+    return await client.get(
+        "/api/v1/todos", params={"page": 1, "page_size": 20}, headers=user.headers
+    )
+
+
+async def create_todo(client: AsyncClient, user: BenchUser) -> Response:
+    return await client.post(
+        "/api/v1/todos",
+        json={"title": "Benchmark todo", "description": "Created by benchmark", "priority": 1},
+        headers=user.headers,
+    )
+
+
+async def toggle_todo(client: AsyncClient, user: BenchUser) -> Response:
+    return await client.post(
+        f"/api/v1/todos/{user.next_todo_id()}/toggle", headers=user.headers
+    )
+
+
+async def fetch_avatar(client: AsyncClient, user: BenchUser) -> Response:
+    return await client.get(user.avatar_url or "/api/v1/users/avatar/missing.png")
+
+
+Scenario = Callable[[AsyncClient, BenchUser], Awaitable[Response]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": login,
+    "refresh": refresh,
+    "list_todos": list_todos,
+    "create_todo": create_todo,
+    "toggle_todo": toggle_todo,
+    "fetch_avatar": fetch_avatar,
+}
@@ -0,0 +1,101 @@
+"""Measure how long importing the application takes.
+
+Runs ``python -X importtime -c "import app.main"`` in fresh interpreters and
+reports the median cumulative import time plus the slowest top-level
+packages. Results can be saved as JSON and compared across commits.
+
+Example:
+    python -m benchmarks.startup --runs 5 -o startup.json
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.run import git_commit
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument("-o", "--output", type=Path, help="write JSON results here")
+    return parser.parse_args()
+
+
+def measure(module: str) -> tuple[float, dict[str, float]]:
+    """Return the module's cumulative import time and per-package times (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    packages: dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, name = match.groups()
+        if name == module:
+            total = int(cumulative_us) / 1000
+        packages[name.split(".")[0]] += int(self_us) / 1000
+    return total, packages
+
+
+def main() -> None:
+    args = parse_args()
+    totals = []
+    package_runs: dict[str, list[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        total, packages = measure(args.module)
+        totals.append(total)
+        for name, ms in packages.items():
+            package_runs[name].append(ms)
+
+    packages = sorted(
+        ((name, statistics.median(values)) for name, values in package_runs.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[: args.top]
+
+    print(f"import {args.module}: median {statistics.median(totals):.1f} ms "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}, {args.runs} runs)")
+    for name, ms in packages:
+        print(f"  {name:<28} {ms:>8.1f} ms")
+
+    if args.output:
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "module": args.module,
+                "runs": args.runs,
+            },
+            "import_ms": {
+                "median": round(statistics.median(totals), 2),
+                "min": round(min(totals), 2),
+                "max": round(max(totals), 2),
+            },
+            "packages_ms": {name: round(ms, 2) for name, ms in packages},
+        }
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
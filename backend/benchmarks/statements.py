@@ -0,0 +1,145 @@
+"""Measure per-query Python overhead of the hot lookup statements.
+
+Compares building ``select(...).where(...)`` on every call with executing the
+prebuilt primary-key statement the request-scoped loader in
+``app/services/loader.py`` runs, and with ``Session.get`` for reference. Runs
+against in-memory SQLite through a synchronous ORM session so that the
+numbers are dominated by SQLAlchemy's own work rather than network or
+driver latency.
+
+Example:
+    python -m benchmarks.statements --queries 20000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models import Base
+from app.models.todo import Todo
+from app.models.user import User
+from app.services.loader import pk_statements
+from benchmarks.run import git_commit
+
+# The statements the app executes, not copies of them
+USER_BY_ID, _ = pk_statements(User)
+TODO_BY_ID, _ = pk_statements(Todo)
+LOOKUPS = ("user_by_id", "todo_by_id")
+VARIANTS = ("inline", "prebuilt", "get")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=10000, help="queries per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("-o", "--output", type=Path, help="write JSON results here")
+    return parser.parse_args()
+
+
+def setup() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    user = User(email="bench@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    session.add(Todo(title="bench", user_id=user.id))
+    session.commit()
+    return session
+
+
+def scenarios(session: Session) -> dict[str, Callable[[], object]]:
+    # expunge_all keeps the identity map from short-circuiting the loads
+    def user_inline() -> object:
+        session.expunge_all()
+        return session.execute(select(User).where(User.id == 1)).scalar_one()
+
+    def user_prebuilt() -> object:
+        session.expunge_all()
+        return session.execute(USER_BY_ID, {"pk": 1}).scalar_one()
+
+    def user_get() -> object:
+        session.expunge_all()
+        return session.get(User, 1)
+
+    def todo_inline() -> object:
+        session.expunge_all()
+        return session.execute(select(Todo).where(Todo.id == 1)).scalar_one()
+
+    def todo_prebuilt() -> object:
+        session.expunge_all()
+        return session.execute(TODO_BY_ID, {"pk": 1}).scalar_one()
+
+    def todo_get() -> object:
+        session.expunge_all()
+        return session.get(Todo, 1)
+
+    return {
+        "user_by_id_inline": user_inline,
+        "user_by_id_prebuilt": user_prebuilt,
+        "user_by_id_get": user_get,
+        "todo_by_id_inline": todo_inline,
+        "todo_by_id_prebuilt": todo_prebuilt,
+        "todo_by_id_get": todo_get,
+    }
+
+
+def measure(func: Callable[[], object], queries: int, rounds: int) -> list[float]:
+    """Microseconds per query for each round."""
+    for _ in range(min(queries, 1000)):  # warm the compiled cache
+        func()
+    results = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(queries):
+            func()
+        results.append((time.perf_counter() - start) / queries * 1_000_000)
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    session = setup()
+    results = {}
+    for name, func in scenarios(session).items():
+        runs = measure(func, args.queries, args.rounds)
+        results[name] = {
+            "median_us": round(statistics.median(runs), 2),
+            "min_us": round(min(runs), 2),
+        }
+        print(f"{name:<22} median {statistics.median(runs):7.2f} us/query "
+              f"(min {min(runs):.2f})")
+
+    for lookup in LOOKUPS:
+        inline = results[f"{lookup}_inline"]["median_us"]
+        for variant in VARIANTS[1:]:
+            saved = inline - results[f"{lookup}_{variant}"]["median_us"]
+            print(f"{lookup}: {variant} saves {saved:.2f} us/query ({saved / inline:.0%})")
+
+    if args.output:
+        output = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "queries": args.queries,
+                "rounds": args.rounds,
+            },
+            "statements": results,
+        }
+        args.output.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""gunicorn settings for pre-fork deployments.
+
+Requires ``gunicorn`` and ``uvicorn-worker``:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master and ``preload()`` builds the
+read-only state (OpenAPI document, lazily imported modules) before the
+workers are forked, so they share it copy-on-write. Engine, pools and
+caches are created per worker in the lifespan. ``scripts/serve.py`` spawns
+fresh interpreters instead and shares nothing.
+"""
+
+import os
+import tempfile
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "0")) or len(os.sched_getaffinity(0))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+graceful_timeout = 30
+keepalive = int(os.environ.get("KEEP_ALIVE_TIMEOUT", "5"))
+forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1")
+# app.access already logs every request with timing
+accesslog = None
+
+if workers > 1 and not os.environ.get("METRICS_MULTIPROC_DIR"):
+    # Set before the app (and its settings) is imported, so workers inherit it
+    os.environ["METRICS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+
+
+def when_ready(server):  # type: ignore[no-untyped-def]
+    # Called in the master after the app is loaded, right before forking
+    from app.main import preload
+
+    preload()
@@ -1,24 +1,23 @@
 #!/usr/bin/env python3
-"""Export OpenAPI schema to JSON file."""
+"""Export OpenAPI schema to JSON file.
+
+Importing the app does not touch the database: the engine is only created
+in the lifespan, which this script never runs.
+"""
 
-import json
 import sys
 from pathlib import Path
 
 # Add the project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.core.openapi import export_schema
 from app.main import app
 
 
 def main() -> None:
-    """Export the OpenAPI schema to a JSON file."""
-    openapi_schema = app.openapi()
-    output_path = Path(__file__).parent.parent / "openapi.json"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(openapi_schema, f, indent=2, ensure_ascii=False)
-
+    """Export the OpenAPI schema and its source fingerprint."""
+    output_path = export_schema(app)
     print(f"OpenAPI schema exported to {output_path}")
 
 
@@ -1,16 +1,46 @@
 #!/usr/bin/env python3
-"""Seed the database with development data."""
+"""Seed the database with development data.
 
+Without arguments two development users are created. With ``--users`` a
+large, reproducible dataset is bulk-inserted for performance testing:
+
+    python scripts/seed.py --users 100000 --todos-per-user 50
+"""
+
+import argparse
 import asyncio
+import random
+import string
 import sys
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
 
 # Add the project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.security import hash_password
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, init_engine
+from app.models.todo import Todo
 from app.models.user import User
+from app.services.todo_stats import rebuild_todo_stats
+
+BULK_PASSWORD = "bulk12345"
+BULK_EMAIL = "bulk-{}@example.com"
+# Timestamps are relative to a fixed instant so a given --seed always
+# produces the same rows
+BULK_BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+TODO_COLUMNS = ("title", "description", "completed", "priority", "user_id", "created_at", "updated_at")
+WORDS = (
+    "review", "write", "fix", "deploy", "call", "plan", "update", "test",
+    "report", "meeting", "invoice", "design", "docs", "release", "backup",
+    "budget", "email", "refactor", "schedule", "order",
+)
 
 
 async def seed_users() -> None:
@@ -50,9 +80,118 @@ async def seed_users() -> None:
         print("Seed data created successfully")
 
 
+def random_description(rng: random.Random) -> str | None:
+    """Most todos have no or a short description, a few have long ones."""
+    if rng.random() < 0.35:
+        return None
+    length = min(int(rng.lognormvariate(4.5, 1.0)), 2000)
+    return "".join(rng.choices(string.ascii_lowercase + " ", k=max(length, 1)))
+
+
+def generate_user(rng: random.Random, index: int, hashed_password: str) -> dict:
+    """Return a bulk user row; about 2% are inactive accounts."""
+    return {
+        "email": BULK_EMAIL.format(index),
+        "hashed_password": hashed_password,
+        "full_name": f"Bulk User {index}",
+        "is_active": rng.random() > 0.02,
+        "is_superuser": False,
+        # Left unset so the purge job never deletes seeded accounts
+        "deactivated_at": None,
+    }
+
+
+def generate_todos(
+    rng: random.Random, user_ids: Iterable[int], todos_per_user: int
+) -> Iterator[tuple]:
+    """Yield todo rows with a realistic mix of priority, status and age."""
+    for user_id in user_ids:
+        for _ in range(todos_per_user):
+            created_at = BULK_BASE_TIME - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            yield (
+                " ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+                random_description(rng),
+                rng.random() < 0.45,
+                rng.choices((0, 1, 2), weights=(60, 30, 10))[0],
+                user_id,
+                created_at,
+                created_at,
+            )
+
+
+async def insert_todos(db: AsyncSession, rows: Iterator[tuple], batch_size: int) -> None:
+    """Insert todo rows with COPY on PostgreSQL or batched executemany elsewhere."""
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        copy_sql = f"COPY todos ({', '.join(TODO_COLUMNS)}) FROM STDIN"
+        async with raw.driver_connection.cursor() as cursor, cursor.copy(copy_sql) as copy:
+            for row in rows:
+                await copy.write_row(row)
+        return
+
+    while batch := list(islice(rows, batch_size)):
+        await db.execute(insert(Todo), [dict(zip(TODO_COLUMNS, row)) for row in batch])
+
+
+async def seed_bulk(
+    users: int, todos_per_user: int, seed: int, batch_size: int
+) -> None:
+    """Bulk-insert a reproducible dataset of users and todos."""
+    rng = random.Random(seed)
+    # Hash once: bcrypt at full cost would dominate the run otherwise
+    hashed_password = hash_password(BULK_PASSWORD)
+    users_per_batch = max(1, batch_size // max(todos_per_user, 1))
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(User.id).where(User.email == BULK_EMAIL.format(0))
+        )
+        if result.scalar_one_or_none():
+            print("Bulk data already exists, skipping seed")
+            return
+
+    started = time.perf_counter()
+    for start in range(0, users, users_per_batch):
+        stop = min(start + users_per_batch, users)
+        async with AsyncSessionLocal() as session:
+            user_ids = list(
+                await session.scalars(
+                    insert(User).returning(User.id, sort_by_parameter_order=True),
+                    [generate_user(rng, i, hashed_password) for i in range(start, stop)],
+                )
+            )
+            await insert_todos(
+                session, generate_todos(rng, user_ids, todos_per_user), batch_size
+            )
+            # COPY bypasses the todo services, so count this batch's todos here
+            await rebuild_todo_stats(session, user_ids)
+            await session.commit()
+        print(f"Seeded {stop}/{users} users ({time.perf_counter() - started:.1f}s)")
+
+    print(
+        f"Bulk seed created {users} users and {users * todos_per_user} todos "
+        f"(password: {BULK_PASSWORD})"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed the database.")
+    parser.add_argument("--users", type=int, help="bulk mode: number of users to create")
+    parser.add_argument("--todos-per-user", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42, help="random seed for reproducible data")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per insert batch")
+    return parser.parse_args()
+
+
 async def main() -> None:
     """Main entry point."""
-    await seed_users()
+    args = parse_args()
+    init_engine()
+    if args.users:
+        await seed_bulk(args.users, args.todos_per_user, args.seed, args.batch_size)
+    else:
+        await seed_users()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""Production server launcher.
+
+Runs uvicorn with one worker per available CPU, uvloop/httptools when they
+are installed, and a bounded graceful shutdown. Migrations and seeding run
+only when requested, so ordinary restarts boot straight into the server:
+
+    python scripts/serve.py                      # serve only
+    python scripts/serve.py --migrate --seed     # leader: migrate, seed, serve
+    RUN_MIGRATIONS=true python scripts/serve.py  # same switch via environment
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Add the project root to Python path (inherited by spawned workers)
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and cgroup quotas."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        count = os.cpu_count() or 1
+
+    # Containers limited with --cpus expose the quota via cgroup v2
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            count = min(count, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, count)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the API server.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8080")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", "0")),
+        help="worker processes (default: one per available CPU)",
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        default=env_flag("RUN_MIGRATIONS"),
+        help="run alembic migrations before serving (env: RUN_MIGRATIONS)",
+    )
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        default=env_flag("RUN_SEED"),
+        help="seed development users before serving (env: RUN_SEED)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=30,
+        help="seconds to wait for in-flight requests on shutdown",
+    )
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=int(os.environ.get("KEEP_ALIVE_TIMEOUT", "5")),
+        help="idle keep-alive timeout; set above the load balancer's",
+    )
+    return parser.parse_args()
+
+
+def run_step(*args: str) -> None:
+    """Run a one-off start-up step in its own process."""
+    subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, check=True)
+
+
+def main() -> None:
+    """Main entry point."""
+    import uvicorn
+
+    args = parse_args()
+
+    # Migrations take an advisory lock on PostgreSQL, so several leaders
+    # starting at once apply them exactly once
+    if args.migrate:
+        run_step("-m", "alembic", "upgrade", "head")
+    if args.seed:
+        run_step("scripts/seed.py")
+
+    workers = args.workers or available_cpus()
+    if workers > 1 and not os.environ.get("METRICS_MULTIPROC_DIR"):
+        # Let /metrics aggregate across workers
+        os.environ["METRICS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    print(f"Starting {workers} worker(s) on {args.host}:{args.port} (loop={loop}, http={http})")
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        forwarded_allow_ips=os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        # app.access already logs every request with timing
+        access_log=False,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import middleware
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.models.user import User
+from app.services.auth import SUPERUSER_CLAIM
+from tests.api.test_todos import get_auth_token
+
+
+async def get_superuser_token(
+    client: AsyncClient, db_session: AsyncSession, email: str
+) -> str:
+    """Helper to create a superuser and return their access token."""
+    await get_auth_token(client, email, "password123")
+    await db_session.execute(
+        update(User).where(User.email == email).values(is_superuser=True)
+    )
+    await db_session.commit()
+    # Log in again so the token carries the superuser claim
+    return await get_auth_token(client, email, "password123")
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+
+
+@pytest.mark.asyncio
+async def test_profile_requires_superuser(
+    client: AsyncClient, profiling_enabled: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that regular users cannot profile the worker."""
+    token = await get_auth_token(client, "regular@example.com", "password123")
+
+    response = await client.get(
+        "/api/v1/admin/profile?seconds=0.1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+    # ?profile=1 is silently ignored for regular and anonymous users, and
+    # never starts the sampler for them
+    def no_sampling(*args: object, **kwargs: object) -> None:
+        raise AssertionError("sampler started")
+
+    monkeypatch.setattr(middleware, "SamplingProfiler", no_sampling)
+    response = await client.get(
+        "/api/v1/todos?profile=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert "items" in response.json()
+
+    response = await client.get("/api/v1/todos?profile=1")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_profile_worker(
+    client: AsyncClient, db_session: AsyncSession, profiling_enabled: None
+) -> None:
+    """Test that superusers get collapsed stacks for the worker."""
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+
+    response = await client.get(
+        "/api/v1/admin/profile?seconds=0.2",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(line.startswith("thread:") for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_profile_single_request(
+    client: AsyncClient, db_session: AsyncSession, profiling_enabled: None
+) -> None:
+    """Test that ?profile=1 returns the request's profile to superusers."""
+    token = await get_superuser_token(client, db_session, "admin2@example.com")
+
+    response = await client.get(
+        "/api/v1/todos?profile=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert response.headers["content-type"].startswith("text/plain")
+
+    # Refreshed tokens keep the superuser claim
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "admin2@example.com", "password": "password123"},
+    )
+    response = await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": response.json()["refresh_token"]}
+    )
+    payload = decode_access_token(response.json()["access_token"])
+    assert payload is not None and payload[SUPERUSER_CLAIM] is True
+
+
+@pytest.mark.asyncio
+async def test_profile_claim_is_rechecked(
+    client: AsyncClient, db_session: AsyncSession, profiling_enabled: None
+) -> None:
+    """Test that a demoted superuser's stale token claim yields no profile."""
+    token = await get_superuser_token(client, db_session, "former@example.com")
+    await db_session.execute(
+        update(User).where(User.email == "former@example.com").values(is_superuser=False)
+    )
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/v1/todos?profile=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert "x-profiled-status" not in response.headers
+    assert "items" in response.json()
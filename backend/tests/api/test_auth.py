@@ -101,3 +101,67 @@ async def test_login_invalid_credentials(client: AsyncClient) -> None:
         },
     )
     assert response.status_code == 401
+
+
+async def login_user(client: AsyncClient, email: str) -> dict:
+    """Helper to register and login a user, returning the token response."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": "password123",
+            "institution_code": TEST_REGISTRATION_INSTITUTION_CODE,
+        },
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": "password123"},
+    )
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotation(client: AsyncClient) -> None:
+    """Test that refreshing rotates the token and rejects reuse."""
+    tokens = await login_user(client, "refresh@example.com")
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    # The old token has been revoked
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 401
+
+    # Reusing a revoked token revokes the whole family
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": rotated["refresh_token"]},
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(client: AsyncClient) -> None:
+    """Test that logout revokes the given refresh token."""
+    tokens = await login_user(client, "logout@example.com")
+
+    response = await client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 401
@@ -0,0 +1,106 @@
+import gzip
+import zlib
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import CompressionMiddleware, negotiate
+
+PAYLOAD = "todo item " * 500
+
+
+def make_app() -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @test_app.get("/large")
+    async def large() -> PlainTextResponse:
+        return PlainTextResponse(PAYLOAD)
+
+    @test_app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @test_app.get("/image")
+    async def image() -> Response:
+        return Response(PAYLOAD.encode(), media_type="image/png")
+
+    @test_app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines() -> AsyncIterator[str]:
+            for i in range(3):
+                yield f'{{"row": {i}}}\n'
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return test_app
+
+
+@pytest.fixture
+def raw_client() -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=make_app()), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_gzipped(raw_client: AsyncClient) -> None:
+    """Test that bodies above the threshold are compressed with Content-Length."""
+    response = await raw_client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(PAYLOAD)
+    assert response.text == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_small_and_image_responses_pass_through(raw_client: AsyncClient) -> None:
+    """Test that small bodies and compressed media are sent as-is."""
+    for path in ("/small", "/image"):
+        response = await raw_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_no_accepted_encoding(raw_client: AsyncClient) -> None:
+    """Test that clients not accepting compression get the plain body."""
+    response = await raw_client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_flushes_each_chunk(raw_client: AsyncClient) -> None:
+    """Test that streamed bodies are compressed incrementally."""
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    lines = []
+    async with raw_client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        async for chunk in response.aiter_raw():
+            # Every chunk must decode on its own thanks to the sync flush
+            lines.append(decoder.decompress(chunk))
+    assert b"".join(lines).decode().splitlines() == [f'{{"row": {i}}}' for i in range(3)]
+
+
+def test_negotiate() -> None:
+    """Test Accept-Encoding negotiation with quality values."""
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("identity") is None
+    assert negotiate("*", offered=["gzip"]) == "gzip"
+    assert negotiate("br;q=0.5, gzip;q=1.0", offered=["br", "gzip"]) == "gzip"
+    assert negotiate("br, gzip", offered=["br", "gzip"]) == "br"
+
+
+@pytest.mark.asyncio
+async def test_openapi_precompressed_variant(client: AsyncClient) -> None:
+    """Test that openapi.json is served from its precompressed variant."""
+    async with client.stream(
+        "GET", "/api/v1/openapi.json", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw).startswith(b"{")
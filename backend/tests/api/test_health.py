@@ -0,0 +1,48 @@
+from collections.abc import Generator
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import health
+from app.services.health import readiness_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_readiness_cache() -> Generator[None, None, None]:
+    """Start every test with an empty readiness cache."""
+    readiness_cache.clear()
+    yield
+    readiness_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_ready_reports_dependencies(client: AsyncClient) -> None:
+    """Test that readiness probes dependencies and caches the result."""
+    response = await client.get("/api/v1/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["cached"] is False
+    assert data["checks"]["database"]["status"] == "ok"
+    assert "latency_ms" in data["checks"]["storage"]
+
+    response = await client.get("/api/v1/ready")
+    assert response.json()["cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_ready_fails_when_database_is_down(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failing dependency makes the pod not ready."""
+
+    async def broken_database(db: object) -> None:
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(health, "check_database", broken_database)
+
+    response = await client.get("/api/v1/ready")
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["checks"]["database"]["error"] == "ConnectionError"
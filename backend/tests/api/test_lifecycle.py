@@ -0,0 +1,42 @@
+import os
+import time
+
+import pytest
+
+from app.core.rate_limit import auth_rate_limiter
+from app.core.security import _password_pool, hash_password_async
+from app.db import session
+from app.main import init_worker, shutdown_worker
+
+
+@pytest.mark.asyncio
+async def test_worker_hooks_create_and_release_per_process_state() -> None:
+    """Test that each worker starts clean and disposes what it created."""
+    auth_rate_limiter._blocked["203.0.113.7"] = time.time()
+
+    engine = init_worker()
+    assert session.engine is engine
+    assert auth_rate_limiter.table_sizes() == {"attempts": 0, "blocked": 0}
+    await hash_password_async("password")
+
+    await shutdown_worker()
+    assert session.engine is None
+    assert session.AsyncSessionLocal.kw["bind"] is None
+
+
+def test_forked_child_does_not_inherit_password_threads() -> None:
+    """Test that a forked worker builds its own hashing pool."""
+    parent_pool = _password_pool()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        from app.core import security
+
+        os.write(write_fd, b"1" if security._password_executor is None else b"0")
+        os._exit(0)
+    os.waitpid(pid, 0)
+    inherited = os.read(read_fd, 1)
+    os.close(read_fd)
+    os.close(write_fd)
+    assert inherited == b"1"
+    assert _password_pool() is parent_pool
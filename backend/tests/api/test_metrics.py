@@ -0,0 +1,66 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.metrics import CACHE_REQUESTS, Counter, Histogram, Registry
+from tests.api.test_todos import get_auth_token
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    """Test that request metrics are exposed per route template."""
+    await client.get("/api/v1/todos/123")
+    await client.get("/api/v1/openapi.json")
+    # A literal segment equal to a parameter value stays literal
+    await client.get("/api/v1/users/avatar/avatar")
+    await client.get("/no/such/page")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/todos/{todo_id}",status="401"}'
+        in body
+    )
+    assert 'route="/api/v1/openapi.json",status="200"' in body
+    assert 'route="/api/v1/users/avatar/{filename}",status="404"' in body
+    assert 'route="<unmatched>",status="404"' in body
+    assert "http_request_duration_seconds_bucket" in body
+    assert "http_requests_in_flight" in body
+    assert 'auth_rate_limiter_entries{table="blocked"}' in body
+
+
+@pytest.mark.asyncio
+async def test_compiled_statement_cache_hits(client: AsyncClient) -> None:
+    """Test that repeated lookups are served from the compiled statement cache."""
+    token = await get_auth_token(client, "cache@example.com", "password123")
+    hits_before = CACHE_REQUESTS.state().get(("sql_compiled", "hit"), 0)
+
+    for _ in range(3):
+        response = await client.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+
+    # The compiled cache is per engine, so only the first lookup may miss
+    assert CACHE_REQUESTS.state()[("sql_compiled", "hit")] >= hits_before + 2
+    assert 'cache_requests_total{cache="sql_compiled",result="hit"}' in (
+        await client.get("/metrics")
+    ).text
+
+
+def test_registry_merges_worker_snapshots() -> None:
+    """Test that snapshots from other workers are summed when rendering."""
+    registry = Registry()
+    requests = Counter("requests_total", "Requests.", ("route",), registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0), registry=registry)
+    requests.inc("/a")
+    latency.observe(0.05)
+
+    other_worker = registry.snapshot()
+    body = registry.render([other_worker])
+
+    assert 'requests_total{route="/a"} 2' in body
+    assert 'latency_seconds_bucket{le="0.1"} 2' in body
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in body
+    assert "latency_seconds_count 2" in body
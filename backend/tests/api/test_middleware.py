@@ -0,0 +1,152 @@
+import pytest
+from httpx import AsyncClient
+from starlette.types import Message, Receive, Scope, Send
+from structlog.testing import capture_logs
+
+from app.core.config import settings
+from app.core.middleware import BodySizeLimitMiddleware
+from tests.api.test_todos import get_auth_token
+
+
+@pytest.mark.asyncio
+async def test_server_timing_counts_queries(client: AsyncClient) -> None:
+    """Test that responses report timing and database query counts."""
+    token = await get_auth_token(client, "timing@example.com", "password123")
+
+    response = await client.get(
+        "/api/v1/todos",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("app;dur=")
+    assert 'desc="3 queries"' in server_timing
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed(client: AsyncClient) -> None:
+    """Test that a client supplied request id is returned."""
+    response = await client.get("/api/v1/health", headers={"X-Request-ID": "abc123"})
+    assert response.headers["x-request-id"] == "abc123"
+
+    response = await client.get("/api/v1/health")
+    assert len(response.headers["x-request-id"]) == 32
+
+
+@pytest.mark.asyncio
+async def test_access_log_can_be_disabled(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the per-request access log line follows its setting."""
+    with capture_logs() as logs:
+        await client.get("/api/v1/health")
+    assert [log["route"] for log in logs if log["event"] == "request"] == ["/api/v1/health"]
+
+    monkeypatch.setattr(settings, "access_log_enabled", False)
+    with capture_logs() as logs:
+        await client.get("/api/v1/health")
+    assert not [log for log in logs if log["event"] == "request"]
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_redacted(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that statements over the threshold are logged without secrets."""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.0)
+
+    with capture_logs() as logs:
+        await client.post(
+            "/api/v1/auth/login",
+            data={"username": "secret@example.com", "password": "password123"},
+        )
+
+    slow = [log for log in logs if log["event"] == "slow_query"]
+    assert slow
+    user_lookup = next(log for log in slow if "FROM users" in log["statement"])
+    assert "secret@example.com" not in str(user_lookup["parameters"])
+    assert "<str len=18>" in str(user_lookup["parameters"])
+    assert len(user_lookup["fingerprint"]) == 16
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_is_rejected_before_reading(client: AsyncClient) -> None:
+    """Test that a declared Content-Length over the limit gets 413 up front."""
+    body = b"x" * (settings.max_request_body_size + 1)
+
+    # Rejected before authentication, so the route never runs
+    response = await client.post(
+        "/api/v1/todos", content=body, headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 413
+    assert response.json()["detail"] == (
+        f"Request body exceeds {settings.max_request_body_size} bytes"
+    )
+    assert response.headers["connection"] == "close"
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_cut_off_at_limit(client: AsyncClient) -> None:
+    """Test that bodies without Content-Length are counted as they arrive."""
+    token = await get_auth_token(client, "limits@example.com", "password123")
+    sent = 0
+
+    async def chunks():
+        nonlocal sent
+        for _ in range(64):
+            sent += 4096
+            yield b'{"title": "' + b"x" * 4085 + b'"'
+
+    response = await client.post(
+        "/api/v1/todos",
+        content=chunks(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 413
+    assert sent <= settings.max_request_body_size + 4096
+
+
+@pytest.mark.asyncio
+async def test_upload_routes_have_larger_limits(client: AsyncClient) -> None:
+    """Test that per-route limits let uploads past the default limit."""
+    token = await get_auth_token(client, "uploader@example.com", "password123")
+    content = b"\x89PNG\r\n\x1a\n" + b"\x00" * (2 * settings.max_request_body_size)
+
+    response = await client.post(
+        "/api/v1/users/me/avatar",
+        files={"file": ("avatar.bin", content, "application/octet-stream")},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    # Past the body limit; rejected by the route for its content type
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("root_path", "path"),
+    [("", "/upload"), ("", "/upload/"), ("/prefix", "/prefix/upload"), ("/prefix", "/upload")],
+)
+async def test_route_limits_ignore_mount_prefix(root_path: str, path: str) -> None:
+    """Test that per-route limits apply under a root_path and with a trailing slash."""
+    reached = []
+
+    async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+        reached.append(scope["path"])
+
+    middleware = BodySizeLimitMiddleware(endpoint, default_limit=10, limits={"/upload": 100})
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "root_path": root_path,
+        "headers": [(b"content-length", b"50")],
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"x" * 50, "more_body": False}
+
+    async def send(message: Message) -> None:
+        raise AssertionError(f"unexpected response: {message}")
+
+    await middleware(scope, receive, send)
+    assert reached == [path]
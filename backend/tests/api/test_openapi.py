@@ -0,0 +1,48 @@
+"""OpenAPI document tests."""
+
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.openapi import load_committed_schema, source_fingerprint
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_openapi_served_with_etag(client: AsyncClient) -> None:
+    """The schema is served as cached bytes and revalidates with ETag."""
+    response = await client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert "/api/v1/auth/login" in response.json()["paths"]
+    etag = response.headers["etag"]
+
+    response = await client.get("/api/v1/openapi.json", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_openapi_gzip_variant(client: AsyncClient) -> None:
+    """Clients accepting gzip get the precompressed body."""
+    response = await client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["info"]["title"] == app.title
+
+
+@pytest.mark.asyncio
+async def test_docs_pages(client: AsyncClient) -> None:
+    """Swagger UI and ReDoc point at the cached schema."""
+    for url in ("/api/docs", "/api/redoc"):
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert "/api/v1/openapi.json" in response.text
+
+
+def test_committed_schema_is_current() -> None:
+    """openapi.json must be re-exported whenever the API changes."""
+    committed = load_committed_schema(source_fingerprint(app))
+    assert committed is not None, "run scripts/export_openapi.py"
+    assert committed == json.loads(json.dumps(app.openapi()))
@@ -0,0 +1,200 @@
+"""Per-endpoint query budgets.
+
+Every endpoint under /api/v1 declares how many SQL statements one request
+may execute. Lower a budget when an endpoint gets cheaper; raising one
+should be a deliberate, reviewed change.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.api.v1.users as users_api
+from app.core.config import settings
+from app.main import app
+from app.models.user import User
+from tests.api.test_auth import login_user
+from tests.utils import assert_max_queries
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+# (method, path) -> maximum statements per request
+QUERY_BUDGETS: dict[tuple[str, str], int] = {
+    ("GET", "/api/v1/health"): 0,
+    ("GET", "/api/v1/ready"): 1,  # SELECT 1
+    ("POST", "/api/v1/auth/login"): 2,  # user by email, INSERT token
+    ("POST", "/api/v1/auth/refresh"): 2,  # revoke ... RETURNING, INSERT token
+    ("POST", "/api/v1/auth/logout"): 3,  # user, token, UPDATE
+    ("POST", "/api/v1/auth/logout-all"): 2,  # user, UPDATE
+    ("POST", "/api/v1/auth/register"): 2,  # email check, INSERT
+    ("GET", "/api/v1/users"): 3,  # user, page, count
+    ("GET", "/api/v1/users/me"): 1,
+    ("PATCH", "/api/v1/users/me"): 2,
+    ("DELETE", "/api/v1/users/me"): 3,  # user, UPDATE, revoke tokens
+    # user, first batch INSERT; later batches stream after the headers, so
+    # Server-Timing does not include them (see test_bulk_import_batches)
+    ("POST", "/api/v1/users/bulk"): 2,
+    ("POST", "/api/v1/users/me/avatar"): 2,
+    ("GET", "/api/v1/users/avatar/{filename}"): 0,
+    ("GET", "/api/v1/todos"): 3,  # user, COUNT, page
+    ("POST", "/api/v1/todos"): 3,  # user, INSERT, stats upsert
+    ("GET", "/api/v1/todos/stats"): 2,
+    ("GET", "/api/v1/todos/{todo_id}"): 2,
+    ("PATCH", "/api/v1/todos/{todo_id}"): 4,
+    ("DELETE", "/api/v1/todos/{todo_id}"): 4,
+    ("POST", "/api/v1/todos/{todo_id}/toggle"): 4,
+    ("GET", "/api/v1/admin/profile"): 1,
+}
+
+
+def auth(ctx: dict[str, Any]) -> dict[str, str]:
+    return {"Authorization": f"Bearer {ctx['access_token']}"}
+
+
+# (method, path) -> request keyword arguments, built from the seeded context
+REQUESTS: dict[tuple[str, str], Callable[[dict[str, Any]], dict[str, Any]]] = {
+    ("GET", "/api/v1/health"): lambda ctx: {},
+    ("GET", "/api/v1/ready"): lambda ctx: {},
+    ("POST", "/api/v1/auth/login"): lambda ctx: {
+        "data": {"username": ctx["email"], "password": "password123"}
+    },
+    ("POST", "/api/v1/auth/refresh"): lambda ctx: {
+        "json": {"refresh_token": ctx["refresh_token"]}
+    },
+    ("POST", "/api/v1/auth/logout"): lambda ctx: {
+        "headers": auth(ctx),
+        "json": {"refresh_token": ctx["refresh_token"]},
+    },
+    ("POST", "/api/v1/auth/logout-all"): lambda ctx: {"headers": auth(ctx)},
+    ("POST", "/api/v1/auth/register"): lambda ctx: {
+        "json": {
+            "email": "new-budget@example.com",
+            "password": "password123",
+            "institution_code": ctx["institution_code"],
+        }
+    },
+    ("GET", "/api/v1/users"): lambda ctx: {"headers": auth(ctx), "params": {"q": "bud"}},
+    ("GET", "/api/v1/users/me"): lambda ctx: {"headers": auth(ctx)},
+    ("PATCH", "/api/v1/users/me"): lambda ctx: {
+        "headers": auth(ctx),
+        "json": {"full_name": "Budget User"},
+    },
+    ("DELETE", "/api/v1/users/me"): lambda ctx: {"headers": auth(ctx)},
+    ("POST", "/api/v1/users/bulk"): lambda ctx: {
+        "headers": auth(ctx),
+        "json": [{"email": "bulk-budget@example.com", "password": "password123"}],
+    },
+    ("POST", "/api/v1/users/me/avatar"): lambda ctx: {
+        "headers": auth(ctx),
+        "files": {"file": ("avatar.png", PNG, "image/png")},
+    },
+    ("GET", "/api/v1/users/avatar/{filename}"): lambda ctx: {},
+    ("GET", "/api/v1/todos"): lambda ctx: {"headers": auth(ctx)},
+    ("POST", "/api/v1/todos"): lambda ctx: {
+        "headers": auth(ctx),
+        "json": {"title": "Another"},
+    },
+    ("GET", "/api/v1/todos/stats"): lambda ctx: {"headers": auth(ctx)},
+    ("GET", "/api/v1/todos/{todo_id}"): lambda ctx: {"headers": auth(ctx)},
+    ("PATCH", "/api/v1/todos/{todo_id}"): lambda ctx: {
+        "headers": auth(ctx),
+        "json": {"title": "Renamed"},
+    },
+    ("DELETE", "/api/v1/todos/{todo_id}"): lambda ctx: {"headers": auth(ctx)},
+    ("POST", "/api/v1/todos/{todo_id}/toggle"): lambda ctx: {"headers": auth(ctx)},
+    ("GET", "/api/v1/admin/profile"): lambda ctx: {
+        "headers": auth(ctx),
+        "params": {"seconds": 0.01},
+    },
+}
+
+
+@pytest_asyncio.fixture
+async def seeded(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> dict[str, Any]:
+    """A logged-in superuser with one todo and one avatar file."""
+    from tests.conftest import TEST_REGISTRATION_INSTITUTION_CODE
+
+    monkeypatch.setattr(users_api, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    (tmp_path / "budget.png").write_bytes(PNG)
+
+    email = "budget@example.com"
+    tokens = await login_user(client, email)
+    await db_session.execute(update(User).where(User.email == email).values(is_superuser=True))
+    await db_session.commit()
+    todo = await client.post(
+        "/api/v1/todos",
+        json={"title": "Budget"},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    return {
+        **tokens,
+        "email": email,
+        "institution_code": TEST_REGISTRATION_INSTITUTION_CODE,
+        "todo_id": todo.json()["id"],
+        "filename": "budget.png",
+    }
+
+
+def test_every_endpoint_has_a_budget() -> None:
+    """New endpoints must declare a query budget."""
+    endpoints = {
+        (method.upper(), path)
+        for path, operations in app.openapi()["paths"].items()
+        if path.startswith("/api/v1/")
+        for method in operations
+    }
+    assert endpoints == set(QUERY_BUDGETS)
+    assert set(REQUESTS) == set(QUERY_BUDGETS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", sorted(QUERY_BUDGETS), ids="{0[0]} {0[1]}".format)
+async def test_query_budget(
+    client: AsyncClient, seeded: dict[str, Any], endpoint: tuple[str, str]
+) -> None:
+    """Each endpoint stays within its declared number of queries."""
+    method, path = endpoint
+    response = await client.request(method, path.format(**seeded), **REQUESTS[endpoint](seeded))
+    # Budgets only mean something for requests that did the real work
+    assert response.status_code < 300, response.text
+    assert_max_queries(response, QUERY_BUDGETS[endpoint])
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_batches(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    seeded: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Each bulk import batch costs one statement, however many a request has."""
+    monkeypatch.setattr(settings, "bulk_user_batch_size", 2)
+    records = [{"email": f"batch-{i}@example.com", "password": "password123"} for i in range(5)]
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.post("/api/v1/users/bulk", json=records, headers=auth(seeded))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.text.count('"created"') == 5
+    # The superuser, then one INSERT for each of the three batches
+    assert len(statements) == 1 + 3, statements
@@ -1,7 +1,12 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.todo import archive_completed_todos
 from tests.conftest import TEST_REGISTRATION_INSTITUTION_CODE
+from tests.utils import assert_max_queries
 
 
 async def get_auth_token(client: AsyncClient, email: str, password: str) -> str:
@@ -127,6 +132,8 @@ async def test_update_todo(client: AsyncClient) -> None:
     data = response.json()
     assert data["title"] == "Updated Title"
     assert data["priority"] == 2
+    # user, todo, UPDATE, stats upsert; the updated row is not read back
+    assert_max_queries(response, 4)
 
 
 @pytest.mark.asyncio
@@ -178,6 +185,7 @@ async def test_toggle_todo(client: AsyncClient) -> None:
     )
     assert response.status_code == 200
     assert response.json()["completed"] is True
+    assert_max_queries(response, 4)
 
     # Toggle back to not completed
     response = await client.post(
@@ -263,3 +271,75 @@ async def test_unauthorized_access(client: AsyncClient) -> None:
     """Test that unauthorized users cannot access todos."""
     response = await client.get("/api/v1/todos")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_todo_stats(client: AsyncClient) -> None:
+    """Test that stats follow creates, updates, toggles and deletes."""
+    token = await get_auth_token(client, "stats_user@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    ids = []
+    for priority in (0, 2, 2):
+        response = await client.post(
+            "/api/v1/todos", json={"title": "Stats", "priority": priority}, headers=headers
+        )
+        ids.append(response.json()["id"])
+
+    await client.post(f"/api/v1/todos/{ids[1]}/toggle", headers=headers)
+    await client.patch(f"/api/v1/todos/{ids[0]}", json={"priority": 1}, headers=headers)
+    await client.patch(f"/api/v1/todos/{ids[0]}", json={"title": "Renamed"}, headers=headers)
+    await client.delete(f"/api/v1/todos/{ids[2]}", headers=headers)
+
+    response = await client.get("/api/v1/todos/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 2,
+        "open": 1,
+        "completed": 1,
+        "by_priority": [
+            {"priority": 0, "open": 0, "completed": 0},
+            {"priority": 1, "open": 1, "completed": 0},
+            {"priority": 2, "open": 0, "completed": 1},
+        ],
+    }
+    # user, one primary-key lookup of the counters
+    assert_max_queries(response, 2)
+
+    # Other users' todos are not counted
+    other = await get_auth_token(client, "stats_other@example.com", "password123")
+    response = await client.get(
+        "/api/v1/todos/stats", headers={"Authorization": f"Bearer {other}"}
+    )
+    assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_list_todos_include_archived(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test that archived todos are hidden by default and flagged when included."""
+    token = await get_auth_token(client, "archive_user@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    for title in ("Old", "Current"):
+        response = await client.post("/api/v1/todos", json={"title": title}, headers=headers)
+        todo_id = response.json()["id"]
+    await client.post(f"/api/v1/todos/{todo_id}/toggle", headers=headers)
+    await archive_completed_todos(
+        db_session, datetime.now(timezone.utc) + timedelta(seconds=1), batch_size=10
+    )
+
+    response = await client.get("/api/v1/todos", headers=headers)
+    assert [item["title"] for item in response.json()["items"]] == ["Old"]
+
+    response = await client.get(
+        "/api/v1/todos", params={"include_archived": True}, headers=headers
+    )
+    data = response.json()
+    assert data["total"] == 2
+    assert {item["title"]: item["archived"] for item in data["items"]} == {
+        "Old": False,
+        "Current": True,
+    }
+
+    # Archived todos still count towards the stats
+    response = await client.get("/api/v1/todos/stats", headers=headers)
+    assert response.json()["completed"] == 1
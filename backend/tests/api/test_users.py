@@ -0,0 +1,371 @@
+import asyncio
+import json
+from collections.abc import Generator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import shutdown_password_pool, verify_password
+from app.main import BODY_SIZE_LIMITS, app
+from app.models.user import User
+from app.services.deactivation import deactivated_users
+from tests.api.test_admin import get_superuser_token
+from tests.api.test_auth import login_user
+from tests.api.test_todos import get_auth_token
+
+
+@pytest.fixture(autouse=True)
+def stop_hash_pools() -> Generator[None, None, None]:
+    yield
+    shutdown_password_pool()
+
+
+def results(response_text: str) -> list[dict]:
+    return [json.loads(line) for line in response_text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_json(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test that superusers can import users and get one result per row."""
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        json=[
+            {"email": "a@example.com", "password": "password123", "full_name": "A"},
+            {"email": "admin@example.com", "password": "password123"},
+            {"email": "a@example.com", "password": "password456"},
+            {"email": "not-an-email", "password": "password123"},
+            {"email": "b@example.com", "password": "short"},
+        ],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = {row["row"]: row for row in results(response.text)}
+    assert rows[1]["status"] == "created"
+    assert rows[1]["id"] > 0
+    assert rows[2]["status"] == "exists"
+    assert rows[3]["status"] == "duplicate"
+    assert rows[4]["status"] == "invalid"
+    assert rows[5]["status"] == "invalid"
+    assert "password" in rows[5]["error"]
+
+    user = await db_session.scalar(select(User).where(User.email == "a@example.com"))
+    assert user is not None
+    assert user.full_name == "A"
+    assert verify_password("password123", user.hashed_password)
+
+    # The imported user can log in
+    assert await get_auth_token(client, "a@example.com", "password123")
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_csv_in_batches(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that CSV uploads are parsed as they stream and inserted in batches."""
+    monkeypatch.setattr(settings, "bulk_user_batch_size", 2)
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+
+    body = "\ufeffemail,password,full_name\r\n" + "".join(
+        f"user{i}@example.com,password{i}x,User {i}\r\n" for i in range(5)
+    ) + "user5@example.com,password5x,"  # no trailing newline
+
+    async def chunks():
+        data = body.encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=chunks(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    rows = results(response.text)
+    assert [row["status"] for row in rows] == ["created"] * 6
+    assert [row["email"] for row in rows] == [f"user{i}@example.com" for i in range(6)]
+
+    count = await db_session.scalar(
+        select(func.count()).select_from(User).where(User.email.like("user%"))
+    )
+    assert count == 6
+    last = await db_session.scalar(select(User).where(User.email == "user5@example.com"))
+    assert last is not None and last.full_name is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_row_limit(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that rows past the import limit are not processed."""
+    monkeypatch.setattr(settings, "bulk_user_max_rows", 1)
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        json=[
+            {"email": "a@example.com", "password": "password123"},
+            {"email": "b@example.com", "password": "password123"},
+        ],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    rows = results(response.text)
+    assert [row["status"] for row in rows] == ["created", "skipped"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_rejects(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test that regular users and bad bodies are rejected before streaming."""
+    token = await get_auth_token(client, "regular@example.com", "password123")
+    response = await client.post(
+        "/api/v1/users/bulk", json=[], headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
+
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("/api/v1/users/bulk", json={"email": "x"}, headers=headers)
+    assert response.status_code == 400
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=b"<users/>",
+        headers={**headers, "Content-Type": "application/xml"},
+    )
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_stops_on_disconnect(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a client leaving mid-import stops the remaining batches."""
+    monkeypatch.setattr(settings, "bulk_user_batch_size", 1)
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+    body = json.dumps(
+        [{"email": f"gone{i}@example.com", "password": "password123"} for i in range(50)]
+    ).encode()
+
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent: list[dict] = []
+    disconnected = asyncio.Event()
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop(0)
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+        # The client hangs up after the first result line
+        if message["type"] == "http.response.body" and message.get("body"):
+            disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/users/bulk",
+        "raw_path": b"/api/v1/users/bulk",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"test"),
+            (b"authorization", f"Bearer {token}".encode()),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=10)
+
+    created = await db_session.scalar(
+        select(func.count()).select_from(User).where(User.email.like("gone%"))
+    )
+    assert 1 <= created < 50
+
+
+async def create_users(db_session: AsyncSession, count: int) -> None:
+    db_session.add_all(
+        User(
+            email=f"member{i:02d}@example.com",
+            hashed_password="x",
+            full_name=f"Member {i:02d}",
+            is_active=i % 3 != 0,
+        )
+        for i in range(count)
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_users_keyset_pages(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test that pages follow the cursor and cover every user exactly once."""
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+    await create_users(db_session, 12)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    seen: list[int] = []
+    params: dict = {"limit": 5}
+    while True:
+        response = await client.get("/api/v1/users", params=params, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 13
+        assert data["total_is_estimate"] is False  # exact outside PostgreSQL
+        seen.extend(item["id"] for item in data["items"])
+        if data["next_cursor"] is None:
+            break
+        params["after"] = data["next_cursor"]
+
+    assert len(seen) == 13
+    assert seen == sorted(set(seen))
+
+    for cursor in ("12", "not-a-cursor", "dXg"):
+        response = await client.get("/api/v1/users", params={"after": cursor}, headers=headers)
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_users_search_and_filter(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test prefix search for short terms, substring search and is_active."""
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+    await create_users(db_session, 12)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def emails(**params) -> list[str]:
+        response = await client.get("/api/v1/users", params=params, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["total"] == len(response.json()["items"])
+        return [item["email"] for item in response.json()["items"]]
+
+    # Short terms match prefixes only: "ad" is not found inside other emails
+    assert await emails(q="AD") == ["admin@example.com"]
+    # Longer terms match anywhere, in email or name
+    assert await emails(q="ber 1") == [f"member{i}@example.com" for i in (10, 11)]
+    assert len(await emails(q="example")) == 13
+    # LIKE wildcards in the term are literal
+    assert await emails(q="mem%") == []
+
+    inactive = await emails(q="member", is_active=False)
+    assert inactive == [f"member{i:02d}@example.com" for i in (0, 3, 6, 9)]
+
+
+@pytest.mark.asyncio
+async def test_list_users_requires_superuser(client: AsyncClient) -> None:
+    """Test that regular users cannot list users."""
+    token = await get_auth_token(client, "regular@example.com", "password123")
+    response = await client.get("/api/v1/users", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_delete_account_ends_sessions(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test that deleting an account revokes tokens and blocks further use."""
+    tokens = await login_user(client, "leaving@example.com")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = await client.delete("/api/v1/users/me", headers=headers)
+    assert response.status_code == 204
+
+    user = await db_session.scalar(select(User).where(User.email == "leaving@example.com"))
+    assert user is not None
+    assert user.is_active is False
+    assert user.deactivated_at is not None
+    assert user.id in deactivated_users
+
+    # The access token is rejected before the user is loaded
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 400
+    assert response.headers["server-timing"].endswith('desc="0 queries"')
+
+    response = await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "leaving@example.com", "password": "password123"},
+    )
+    assert response.status_code == 401
+
+    # Another worker without the cache entry still rejects the user
+    deactivated_users.clear()
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 400
+    assert user.id in deactivated_users
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_csv_multiline_field(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test that a quoted field may span lines, even across chunks."""
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+    body = (
+        'email,password,full_name\r\n'
+        'quoted@example.com,password123,"Ann\r\n""The Admin"", HQ"\r\n'
+        "plain@example.com,password123,Bob\r\n"
+    )
+
+    async def chunks():
+        data = body.encode()
+        for start in range(0, len(data), 5):
+            yield data[start : start + 5]
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=chunks(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    rows = results(response.text)
+    assert [(row["row"], row["status"]) for row in rows] == [(1, "created"), (2, "created")]
+    user = await db_session.scalar(select(User).where(User.email == "quoted@example.com"))
+    assert user is not None
+    assert user.full_name == 'Ann\r\n"The Admin", HQ'
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_csv_body_limit(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a CSV stream cut off by the body limit keeps the rows read so far."""
+    monkeypatch.setattr(settings, "bulk_user_batch_size", 2)
+    token = await get_superuser_token(client, db_session, "admin@example.com")
+    lines = [b"email,password\r\n"] + [
+        f"user{i}@example.com,password{i}x\r\n".encode() for i in range(100)
+    ]
+    # Limit falls inside row 4: rows 1-3 are complete
+    limit = sum(len(line) for line in lines[:4]) + 5
+    monkeypatch.setitem(BODY_SIZE_LIMITS, "/api/v1/users/bulk", limit)
+
+    async def chunks():
+        for line in lines:
+            yield line
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=chunks(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    rows = results(response.text)
+    assert [row["status"] for row in rows] == ["created"] * 3 + ["skipped"]
+    assert rows[-1]["row"] == 4
+    assert rows[-1]["error"] == f"Request body exceeds {limit} bytes"
@@ -8,8 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 from app.api.deps import get_db
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
 from app.main import app
 from app.models import Base
+from app.services.deactivation import deactivated_users
 
 # Use SQLite for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -28,6 +30,7 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a test database session."""
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    instrument_engine(engine)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -48,6 +51,12 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create a test client with the test database."""
 
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        # Start each request with an empty identity map, as a real
+        # per-request session would, so lookups are not served from rows
+        # loaded by earlier requests or by the test itself.
+        await db_session.flush()
+        db_session.expunge_all()
+        db_session.info.clear()
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
@@ -59,6 +68,8 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield client
 
     app.dependency_overrides.clear()
+    # User ids are reused by the next test's fresh database
+    deactivated_users.clear()
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from app.core.config import Settings
+
+ENV_EXAMPLE = Path(__file__).resolve().parents[2] / ".env.example"
+
+
+def test_env_example_loads() -> None:
+    """Test that the example env file parses as-is."""
+    loaded = Settings(_env_file=ENV_EXAMPLE)  # type: ignore[call-arg]
+    assert loaded.todo_archive_after_days is None
+    assert loaded.database_prepare_threshold == 2
+    assert loaded.deactivated_user_purge_after_days == 30
+
+
+def test_empty_values_disable_optional_settings(tmp_path: Path) -> None:
+    """Test that blank optional numbers are read as unset rather than rejected."""
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "DATABASE_PREPARE_THRESHOLD=\nDEACTIVATED_USER_PURGE_AFTER_DAYS=\nSLOW_QUERY_THRESHOLD_MS=\n"
+    )
+    loaded = Settings(_env_file=env_file)  # type: ignore[call-arg]
+    assert loaded.database_prepare_threshold is None
+    assert loaded.deactivated_user_purge_after_days is None
+    assert loaded.slow_query_threshold_ms is None
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.deactivation as deactivation
+from app.core.security import hash_token
+from app.models.refresh_token import RefreshToken
+from app.models.todo import Todo
+from app.models.todo_archive import TodoArchive
+from app.models.todo_stats import TodoStats
+from app.models.user import User
+from app.services.deactivation import (
+    DeactivatedUsers,
+    deactivate_user,
+    deactivated_users,
+    purge_deactivated_users,
+)
+
+
+async def create_user(
+    db: AsyncSession, email: str, deactivated_at: datetime | None, avatar: str | None = None
+) -> int:
+    """Helper to add a user with todos, an archived todo, tokens and stats."""
+    user = User(
+        email=email,
+        hashed_password="x",
+        is_active=deactivated_at is None,
+        deactivated_at=deactivated_at,
+        avatar=avatar,
+    )
+    db.add(user)
+    await db.flush()
+    now = datetime.now(timezone.utc)
+    db.add_all(Todo(title=f"todo {i}", user_id=user.id) for i in range(5))
+    db.add(
+        TodoArchive(
+            id=10_000 + user.id, title="old", completed=True, priority=0,
+            user_id=user.id, created_at=now, updated_at=now,
+        )
+    )
+    db.add_all(
+        RefreshToken(
+            user_id=user.id,
+            token_hash=hash_token(f"{email}-{i}"),
+            token_family="family",
+            expires_at=now + timedelta(days=1),
+        )
+        for i in range(3)
+    )
+    db.add(TodoStats(user_id=user.id, completed=False, priority=0, count=5))
+    await db.commit()
+    return user.id
+
+
+async def count(db: AsyncSession, model: type, user_id: int) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(model).where(model.user_id == user_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_purge_deactivated_users(
+    db_session: AsyncSession, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that only accounts past the grace period are purged, with their data."""
+    monkeypatch.setattr(deactivation, "UPLOAD_DIR", tmp_path)
+    (tmp_path / "old.png").write_bytes(b"avatar")
+
+    now = datetime.now(timezone.utc)
+    expired = await create_user(
+        db_session, "expired@example.com", now - timedelta(days=40),
+        avatar="/api/v1/users/avatar/old.png",
+    )
+    recent = await create_user(db_session, "recent@example.com", now - timedelta(days=1))
+    active = await create_user(db_session, "active@example.com", None)
+
+    purged = await purge_deactivated_users(db_session, now - timedelta(days=30), batch_size=2)
+
+    assert purged == 1
+    assert await db_session.get(User, expired) is None
+    for model in (Todo, TodoArchive, RefreshToken, TodoStats):
+        assert await count(db_session, model, expired) == 0
+        assert await count(db_session, model, recent) > 0
+        assert await count(db_session, model, active) > 0
+    assert not (tmp_path / "old.png").exists()
+
+
+def test_deactivated_users_cache_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that cached ids expire after the configured time."""
+    clock = [100.0]
+    monkeypatch.setattr(deactivation.time, "monotonic", lambda: clock[0])
+    cache = DeactivatedUsers()
+    cache.add(7)
+    assert 7 in cache
+    assert 8 not in cache
+
+    clock[0] += deactivation.settings.deactivated_user_cache_seconds + 1
+    assert 7 not in cache
+
+
+@pytest.mark.asyncio
+async def test_deactivation_cached_only_after_commit(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failed commit leaves the user out of the cache."""
+    user_id = await create_user(db_session, "rollback@example.com", None)
+    user = await db_session.get(User, user_id)
+    assert user is not None
+
+    async def failing_commit() -> None:
+        raise RuntimeError("commit failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(db_session, "commit", failing_commit)
+        with pytest.raises(RuntimeError):
+            await deactivate_user(db_session, user)
+    assert user_id not in deactivated_users
+
+    await db_session.rollback()
+    user = await db_session.get(User, user_id)
+    assert user is not None
+    await deactivate_user(db_session, user)
+    assert user_id in deactivated_users
+    deactivated_users.clear()
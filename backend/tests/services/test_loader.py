@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.instrumentation import start_request_stats, stop_request_stats
+from app.models.todo import Todo
+from app.models.user import User
+from app.services.loader import loader
+from app.services.todo import get_todo_by_id
+from app.services.user import get_user_by_id
+
+
+async def create_user_with_todo(db: AsyncSession) -> tuple[int, int]:
+    user = User(email="loader@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+    todo = Todo(title="loader", user_id=user.id)
+    db.add(todo)
+    await db.flush()
+    ids = user.id, todo.id
+    db.expunge_all()
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_repeated_lookups_hit_the_identity_map(db_session: AsyncSession) -> None:
+    """Test that a row is queried once per session, however often it is requested."""
+    user_id, todo_id = await create_user_with_todo(db_session)
+    stats, token = start_request_stats()
+    try:
+        first = await get_user_by_id(db_session, user_id)
+        assert await get_user_by_id(db_session, user_id) is first
+        assert await get_todo_by_id(db_session, todo_id, user_id) is not None
+        assert await get_todo_by_id(db_session, todo_id, user_id) is not None
+        # Someone else's todo is not returned, and needs no new query either
+        assert await get_todo_by_id(db_session, todo_id, user_id + 1) is None
+    finally:
+        stop_request_stats(token)
+    assert stats.db_queries == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_batched(db_session: AsyncSession) -> None:
+    """Test that lookups issued together share one IN query."""
+    user_id, _ = await create_user_with_todo(db_session)
+    stats, token = start_request_stats()
+    try:
+        users = await asyncio.gather(
+            loader(db_session, User).load(user_id),
+            loader(db_session, User).load(user_id),
+            loader(db_session, User).load(user_id + 100),
+        )
+    finally:
+        stop_request_stats(token)
+    assert users[0] is users[1] is not None
+    assert users[2] is None
+    assert stats.db_queries == 1
+
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_of_different_models(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that gathered lookups of two models never use the session at once."""
+    user_id, todo_id = await create_user_with_todo(db_session)
+    execute = db_session.execute
+    running: list[asyncio.Task[object] | None] = []
+
+    async def exclusive_execute(*args: object, **kwargs: object) -> object:
+        # An AsyncSession cannot serve two statements at the same time
+        assert not running
+        running.append(asyncio.current_task())
+        try:
+            await asyncio.sleep(0)
+            return await execute(*args, **kwargs)  # type: ignore[arg-type]
+        finally:
+            running.pop()
+
+    monkeypatch.setattr(db_session, "execute", exclusive_execute)
+    user, todo = await asyncio.gather(
+        get_user_by_id(db_session, user_id), get_todo_by_id(db_session, todo_id, user_id)
+    )
+    assert user is not None
+    assert todo is not None
+    assert todo.user_id == user.id
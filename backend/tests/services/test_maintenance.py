@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.scheduler import Scheduler
+from app.core.security import hash_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.refresh_token import cleanup_expired_tokens
+
+
+async def create_tokens(db: AsyncSession, expired: int, active: int) -> None:
+    """Helper to insert expired and active refresh tokens for one user."""
+    user = User(email="tokens@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+
+    now = datetime.now(timezone.utc)
+    for i in range(expired + active):
+        offset = timedelta(days=-1) if i < expired else timedelta(days=1)
+        db.add(
+            RefreshToken(
+                user_id=user.id,
+                token_hash=hash_token(f"token-{i}"),
+                token_family="family",
+                expires_at=now + offset,
+            )
+        )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_expired_tokens_in_batches(db_session: AsyncSession) -> None:
+    """Test that batched cleanup removes only expired tokens."""
+    await create_tokens(db_session, expired=7, active=3)
+
+    deleted = await cleanup_expired_tokens(db_session, batch_size=3)
+
+    assert deleted == 7
+    remaining = await db_session.scalar(select(func.count(RefreshToken.id)))
+    assert remaining == 3
+
+
+@pytest.mark.asyncio
+async def test_scheduler_records_job_metrics() -> None:
+    """Test that job runs and failures are recorded."""
+    scheduler = Scheduler()
+
+    async def succeed() -> int:
+        return 5
+
+    async def fail() -> int:
+        raise RuntimeError("boom")
+
+    ok_job = scheduler.register("ok", succeed, interval_seconds=60)
+    failing_job = scheduler.register("failing", fail, interval_seconds=60)
+
+    await scheduler.run_job(ok_job)
+    await scheduler.run_job(failing_job)
+
+    assert ok_job.stats.runs == 1
+    assert ok_job.stats.failures == 0
+    assert ok_job.stats.last_result == 5
+    assert failing_job.stats.runs == 1
+    assert failing_job.stats.failures == 1
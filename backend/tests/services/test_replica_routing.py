@@ -0,0 +1,156 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.api.deps import get_primary_db
+from app.db import session as db_session_module
+from app.db.session import (
+    ReplicaSet,
+    RoutingSession,
+    bind_user,
+    get_db,
+    recent_writers,
+)
+from app.models import Base
+from app.models.todo_stats import TodoStats
+from app.models.user import User
+
+
+async def make_database(path: Path, email: str) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        session.add(User(email=email, hashed_password="x"))
+        await session.commit()
+    return engine
+
+
+@pytest_asyncio.fixture
+async def routed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """A primary and one replica holding different rows, to see who answered."""
+    primary = await make_database(tmp_path / "primary.db", "primary@example.com")
+    replica = await make_database(tmp_path / "replica.db", "replica@example.com")
+    monkeypatch.setattr(db_session_module, "replicas", ReplicaSet([replica]))
+    recent_writers.clear()
+    yield async_sessionmaker(
+        primary, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    )
+    recent_writers.clear()
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def emails(db: AsyncSession) -> list[str]:
+    return list((await db.execute(select(User.email).order_by(User.id))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_first_write(routed: async_sessionmaker[AsyncSession]) -> None:
+    """Test that SELECTs use the replica and pin to the primary after a write."""
+    async with routed() as db:
+        assert await emails(db) == ["replica@example.com"]
+        # Locking reads always use the primary
+        locked = await db.execute(select(User.email).with_for_update())
+        assert locked.scalars().all() == ["primary@example.com"]
+
+        db.add(User(email="new@example.com", hashed_password="x"))
+        await db.flush()
+        assert await emails(db) == ["primary@example.com", "new@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_recent_writer_reads_from_primary(routed: async_sessionmaker[AsyncSession]) -> None:
+    """Test the per-user read-your-writes window across requests."""
+    recent_writers.record(42)
+    async with routed() as db:
+        bind_user(db, 42)
+        assert await emails(db) == ["primary@example.com"]
+    async with routed() as db:
+        bind_user(db, 7)
+        assert await emails(db) == ["replica@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_primary_db_for_credential_checks(
+    routed: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test that the auth dependency sends every read to the primary."""
+    async with routed() as db:
+        assert await get_primary_db(db) is db
+        assert await emails(db) == ["primary@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_get_db_records_writers(
+    routed: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a request that wrote starts the user's window."""
+    monkeypatch.setattr(db_session_module, "AsyncSessionLocal", routed)
+    monkeypatch.setattr(db_session_module, "get_engine", lambda: None)
+
+    dependency = get_db()
+    db = await dependency.__anext__()
+    bind_user(db, 5)
+    db.add(User(email="writer@example.com", hashed_password="x"))
+    await db.flush()
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    assert recent_writers.wrote_recently(5)
+
+
+@pytest.mark.asyncio
+async def test_failing_replica_is_ejected(
+    tmp_path: Path, routed: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an unreachable replica is ejected and the read falls back."""
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    replicas = ReplicaSet([broken])
+    monkeypatch.setattr(db_session_module, "replicas", replicas)
+
+    async with routed() as db:
+        assert await emails(db) == ["primary@example.com"]
+        await db.commit()
+    assert replicas.healthy() == 0
+
+    async with routed() as db:
+        assert await emails(db) == ["primary@example.com"]
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_replica_failing_mid_session_falls_back(
+    routed: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that scalar() retries on the primary and the session still commits."""
+    (replica,) = db_session_module.replicas.engines
+    async with replica.begin() as conn:
+        await conn.execute(text("DROP TABLE todo_stats"))
+
+    def lost_connection(context: ExceptionContext) -> None:
+        # Treat the replica's error as a dropped connection
+        context.is_disconnect = True
+
+    # Registered ahead of the ejection handler, which sees the flag
+    event.listen(replica.sync_engine, "handle_error", lost_connection)
+    replicas = ReplicaSet([replica])
+    monkeypatch.setattr(db_session_module, "replicas", replicas)
+
+    async with routed() as db:
+        assert await emails(db) == ["replica@example.com"]
+        count = await db.scalar(select(func.count()).select_from(TodoStats))
+        assert count == 0
+        assert replicas.healthy() == 0
+        await db.commit()
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.todo import Todo
+from app.models.todo_archive import TodoArchive
+from app.models.user import User
+from app.services.todo import archive_completed_todos, get_todos
+
+
+async def create_todos(db: AsyncSession) -> tuple[int, datetime]:
+    """Helper to add old and recent, open and completed todos for one user."""
+    user = User(email="archive@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=90)
+    for i in range(10):
+        # 7 old completed, 1 old open, 2 recently completed
+        completed = i != 7
+        updated_at = old if i < 8 else now
+        db.add(
+            Todo(
+                title=f"todo {i}",
+                user_id=user.id,
+                completed=completed,
+                priority=i % 3,
+                created_at=updated_at,
+                updated_at=updated_at,
+            )
+        )
+    await db.commit()
+    return user.id, now - timedelta(days=30)
+
+
+@pytest.mark.asyncio
+async def test_archive_completed_todos_in_batches(db_session: AsyncSession) -> None:
+    """Test that only old completed todos move, keeping ids and fields."""
+    user_id, cutoff = await create_todos(db_session)
+
+    archived = await archive_completed_todos(db_session, cutoff, batch_size=3)
+
+    assert archived == 7
+    assert await db_session.scalar(select(func.count(Todo.id))) == 3
+    rows = (await db_session.scalars(select(TodoArchive).order_by(TodoArchive.id))).all()
+    assert [row.title for row in rows] == [f"todo {i}" for i in range(7)]
+    assert all(row.completed and row.user_id == user_id for row in rows)
+
+    # Nothing left to move
+    assert await archive_completed_todos(db_session, cutoff, batch_size=3) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_todos_include_archived(db_session: AsyncSession) -> None:
+    """Test that archived todos are listed only when asked for."""
+    user_id, cutoff = await create_todos(db_session)
+    await archive_completed_todos(db_session, cutoff, batch_size=100)
+
+    todos, total = await get_todos(db_session, user_id, page_size=100)
+    assert total == 3
+    assert all(isinstance(todo, Todo) for todo in todos)
+
+    rows, total = await get_todos(db_session, user_id, page_size=4, include_archived=True)
+    assert total == 10
+    assert len(rows) == 4
+    # Ordered by priority across both tables
+    assert [row.priority for row in rows] == [2, 2, 2, 1]
+
+    rows, total = await get_todos(
+        db_session, user_id, completed=True, page_size=100, include_archived=True
+    )
+    assert total == 9
+    assert sum(row.archived for row in rows) == 7
+
+    # Archived todos are all completed, so the archive is not read at all
+    rows, total = await get_todos(
+        db_session, user_id, completed=False, page_size=100, include_archived=True
+    )
+    assert total == 1
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.todo import Todo
+from app.models.todo_stats import TodoStats
+from app.models.user import User
+from app.schemas.todo import TodoCreate
+from app.services.todo import (
+    create_todo,
+    delete_todo,
+    get_todo_by_id,
+    get_todo_for_update,
+    toggle_todo,
+)
+from app.services.todo_stats import get_todo_stats, rebuild_todo_stats
+
+
+@pytest.mark.asyncio
+async def test_rebuild_todo_stats(db_session: AsyncSession) -> None:
+    """Test that a rebuild recounts only the given users from the todos table."""
+    users = [User(email=f"stats{i}@example.com", hashed_password="x") for i in range(2)]
+    db_session.add_all(users)
+    await db_session.flush()
+    # Inserted directly, bypassing the services that maintain the counters
+    db_session.add_all(
+        Todo(title="t", user_id=user.id, completed=i % 2 == 0, priority=i % 3)
+        for user in users
+        for i in range(6)
+    )
+    await db_session.commit()
+
+    await rebuild_todo_stats(db_session, [users[0].id])
+    await db_session.commit()
+
+    stats = await get_todo_stats(db_session, users[0].id)
+    assert sum(stats.values()) == 6
+    assert stats[(True, 0)] == 1
+    assert stats[(False, 1)] == 1
+    assert await get_todo_stats(db_session, users[1].id) == {}
+
+    await rebuild_todo_stats(db_session)
+    await db_session.commit()
+    total = await db_session.scalar(select(func.sum(TodoStats.count)))
+    assert total == 12
+
+
+@pytest.mark.asyncio
+async def test_interleaved_todo_mutations_keep_stats(tmp_path: Path) -> None:
+    """Test that a mutation re-reads a todo another session changed meanwhile."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'todos.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as first, sessions() as second:
+        user = User(email="interleaved@example.com", hashed_password="x")
+        first.add(user)
+        await first.flush()
+        todo = await create_todo(first, user.id, TodoCreate(title="t", priority=1))
+        await first.commit()
+
+        # The first session keeps its now stale copy of the todo
+        assert await get_todo_by_id(first, todo.id, user.id) is todo
+        other = await get_todo_for_update(second, todo.id, user.id)
+        assert other is not None
+        await toggle_todo(second, other)
+        await second.commit()
+
+        locked = await get_todo_for_update(first, todo.id, user.id)
+        assert locked is todo
+        assert locked.completed
+        await toggle_todo(first, locked)
+        await first.commit()
+        assert await get_todo_stats(first, user.id) == {(False, 1): 1}
+
+        await delete_todo(second, other)
+        assert await get_todo_for_update(first, todo.id, user.id) is None
+
+    await engine.dispose()
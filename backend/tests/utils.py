@@ -0,0 +1,23 @@
+"""Shared test helpers."""
+
+import re
+
+from httpx import Response
+
+_QUERY_COUNT = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def query_count(response: Response) -> int:
+    """Number of database queries a request made, from its Server-Timing header."""
+    match = _QUERY_COUNT.search(response.headers.get("server-timing", ""))
+    assert match, "response has no Server-Timing db entry"
+    return int(match.group(1))
+
+
+def assert_max_queries(response: Response, limit: int) -> None:
+    """Fail if handling the request took more than ``limit`` queries."""
+    count = query_count(response)
+    assert count <= limit, (
+        f"{response.request.method} {response.request.url.path} made {count} "
+        f"queries, budget is {limit}"
+    )